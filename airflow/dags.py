@@ -88,6 +88,47 @@ def extract_binance_data(**context):
         print(f"✗ Error extracting Binance data: {e}")
         raise
 
+def extract_binance_incremental(**context):
+    """Extract only new klines and trades from Binance since the last run"""
+    from source.extracts_binance import BinanceClient
+    from source.incremental import WatermarkStore, extract_new_klines, extract_new_trades
+    from source.loads import LocalLoader
+    
+    symbols = ['BTCUSDT', 'ETHUSDT', 'SOLUSDT']
+    interval = '1h'
+    
+    try:
+        data_dir = "/Users/anthony/Desktop/Project Storage /RiskCoin-Detected/data"
+        loader = LocalLoader(base_path=data_dir)
+        store = WatermarkStore(base_path=data_dir)
+        client = BinanceClient()
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        
+        total = 0
+        for symbol in symbols:
+            klines, kline_mark = extract_new_klines(client, store, symbol, interval)
+            if klines:
+                path = f"raw/binance/klines/{symbol}_{interval}_{timestamp}.json"
+                if not loader.write_raw(klines, path):
+                    raise IOError(f"Failed to write klines for {symbol}")
+                store.update('binance', symbol, interval, kline_mark)
+            
+            trades, trade_mark = extract_new_trades(client, store, symbol)
+            if trades:
+                path = f"raw/binance/trades/{symbol}_{timestamp}.json"
+                if not loader.write_raw(trades, path):
+                    raise IOError(f"Failed to write trades for {symbol}")
+                store.update('binance', symbol, None, trade_mark)
+            
+            print(f"✓ {symbol}: {len(klines)} new klines, {len(trades)} new trades")
+            total += len(klines) + len(trades)
+        
+        return total
+        
+    except Exception as e:
+        print(f"✗ Error extracting incremental Binance data: {e}")
+        raise
+
 # Define tasks
 extract_cg = PythonOperator(
     task_id='extract_coingecko',
@@ -101,6 +142,12 @@ extract_binance = PythonOperator(
     dag=dag,
 )
 
+extract_binance_incr = PythonOperator(
+    task_id='extract_binance_incremental',
+    python_callable=extract_binance_incremental,
+    dag=dag,
+)
+
 # Set task dependencies - CoinGecko runs first, then Binance
-extract_cg >> extract_binance
+extract_cg >> extract_binance >> extract_binance_incr
 
@@ -5,7 +5,7 @@ Combines volatility, liquidity, sentiment, and on-chain metrics.
 
 import pandas as pd
 import numpy as np
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 
 
 def compute_risk_score(
@@ -70,6 +70,170 @@ def compute_risk_score(
     return df
 
 
+# Component -> (input column, higher value = higher risk[, center]);
+# with a center, risk grows with the distance |value - center| instead
+RISK_COMPONENTS = {
+    'volatility': ('realized_vol_7', True),
+    'liquidity': ('liquidity_score', False),
+    'sentiment': ('sentiment_score', False),
+    'momentum': ('rsi', True, 50),  # Oversold and overbought are both risky
+}
+
+DEFAULT_WEIGHTS = {
+    'volatility': 0.35,
+    'liquidity': 0.25,
+    'sentiment': 0.20,
+    'momentum': 0.20
+}
+
+
+def latest_snapshot(
+    features_df: pd.DataFrame,
+    coin_col: str = 'coin_id',
+    timestamp_col: str = 'timestamp'
+) -> pd.DataFrame:
+    """
+    Latest feature row of every coin.
+    
+    Args:
+        features_df: Long feature DataFrame for many coins
+        coin_col: Name of coin identifier column
+        timestamp_col: Name of timestamp column
+    
+    Returns:
+        DataFrame indexed by coin with one row per coin
+    """
+    df = features_df.sort_values([coin_col, timestamp_col], kind='stable')
+    return df.groupby(coin_col, sort=False).tail(1).set_index(coin_col)
+
+
+class CrossSectionalRiskEngine:
+    """
+    Batch risk scoring of the whole coin universe from one feature snapshot.
+    
+    Each component is normalized against all coins at once (percentile
+    rank or clipped z-score) instead of against the coin's own history,
+    then combined with one or more weight sets in a single matrix product.
+    """
+    
+    def __init__(
+        self,
+        components: Dict[str, tuple] = RISK_COMPONENTS,
+        normalization: str = 'rank',
+        weight_sets: Optional[Dict[str, Dict[str, float]]] = None
+    ):
+        """
+        Initialize risk engine.
+        
+        Args:
+            components: Component -> (input column, higher value = higher
+                risk) or (input column, higher value = higher risk, center)
+                to score the distance from a neutral center value
+            normalization: 'rank' (cross-sectional percentile, 0-100) or
+                'zscore' (z-score clipped to +/-3 and mapped to 0-100)
+            weight_sets: Named weight sets (default: {'default': DEFAULT_WEIGHTS})
+        """
+        if normalization not in ('rank', 'zscore'):
+            raise ValueError(f"Unknown normalization: {normalization}")
+        self.components = dict(components)
+        self.normalization = normalization
+        self.weight_sets: Dict[str, Dict[str, float]] = {}
+        for name, weights in (weight_sets or {'default': DEFAULT_WEIGHTS}).items():
+            self.set_weights(name, weights)
+    
+    def set_weights(self, name: str, weights: Dict[str, float]) -> None:
+        """
+        Add or replace a weight set.
+        
+        Weights are rescaled to sum to 1 so component contributions add up
+        to the risk score.
+        """
+        unknown = set(weights) - set(self.components)
+        if unknown:
+            raise ValueError(f"Unknown risk components: {sorted(unknown)}")
+        total = sum(weights.values())
+        if total <= 0 or any(w < 0 for w in weights.values()):
+            raise ValueError("Weights must be non-negative with a positive sum")
+        self.weight_sets[name] = {k: weights.get(k, 0.0) / total for k in self.components}
+    
+    def _weight_matrix(self, names: List[str]) -> np.ndarray:
+        return np.array([[self.weight_sets[n][c] for n in names] for c in self.components])
+    
+    def component_scores(self, snapshot: pd.DataFrame) -> pd.DataFrame:
+        """
+        Cross-sectionally normalized component risk, 0-100 (higher = riskier).
+        
+        Missing columns and missing values score a neutral 50.
+        
+        Args:
+            snapshot: One row per coin with feature columns
+        
+        Returns:
+            DataFrame aligned with snapshot, one column per component
+        """
+        raw = np.full((len(snapshot), len(self.components)), np.nan)
+        signs = np.empty(len(self.components))
+        for j, (column, higher_is_riskier, *center) in enumerate(self.components.values()):
+            signs[j] = 1.0 if higher_is_riskier else -1.0
+            if column in snapshot.columns:
+                raw[:, j] = snapshot[column].to_numpy(dtype=np.float64)
+                if center and center[0] is not None:
+                    raw[:, j] = np.abs(raw[:, j] - center[0])
+        raw = raw * signs
+        
+        if self.normalization == 'rank':
+            ranks = pd.DataFrame(raw).rank(method='average')
+            counts = np.isfinite(raw).sum(axis=0)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                scores = np.where(counts > 1, (ranks.to_numpy() - 1) / (counts - 1) * 100, 50.0)
+        else:
+            mean = np.nanmean(raw, axis=0)
+            std = np.nanstd(raw, axis=0)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                z = np.where(std > 0, (raw - mean) / std, 0.0)
+            scores = 50 + np.clip(z, -3, 3) * (50 / 3)
+        
+        scores = np.where(np.isnan(raw), 50.0, scores)
+        return pd.DataFrame(scores, index=snapshot.index, columns=list(self.components))
+    
+    def score(self, snapshot: pd.DataFrame, weight_set: str = 'default') -> pd.DataFrame:
+        """
+        Score every coin with one weight set.
+        
+        Args:
+            snapshot: One row per coin with feature columns
+            weight_set: Name of a weight set added with set_weights
+        
+        Returns:
+            DataFrame aligned with snapshot with {component}_risk,
+            {component}_contribution, risk_score (0-100) and risk_rank
+            (1 = riskiest)
+        """
+        scores = self.component_scores(snapshot)
+        weights = self._weight_matrix([weight_set])[:, 0]
+        contributions = scores.to_numpy() * weights
+        
+        result = pd.DataFrame(index=snapshot.index)
+        for j, component in enumerate(self.components):
+            result[f'{component}_risk'] = scores.iloc[:, j]
+            result[f'{component}_contribution'] = contributions[:, j]
+        result['risk_score'] = contributions.sum(axis=1)
+        result['risk_rank'] = result['risk_score'].rank(ascending=False, method='min').astype(int)
+        return result
+    
+    def score_all(self, snapshot: pd.DataFrame) -> pd.DataFrame:
+        """
+        Score every coin with every weight set in one matrix product.
+        
+        Returns:
+            DataFrame aligned with snapshot with one risk_score_{name}
+            column per weight set
+        """
+        names = list(self.weight_sets)
+        totals = self.component_scores(snapshot).to_numpy() @ self._weight_matrix(names)
+        return pd.DataFrame(totals, index=snapshot.index, columns=[f'risk_score_{n}' for n in names])
+
+
 # Example usage
 if __name__ == "__main__":
     sample_df = pd.DataFrame({
@@ -82,3 +246,26 @@ if __name__ == "__main__":
     
     result = compute_risk_score(sample_df)
     print(result[['coin_id', 'risk_score']])
+    
+    # Cross-sectional scoring of a large universe
+    import time
+    
+    rng = np.random.default_rng(42)
+    n = 10_000
+    snapshot = pd.DataFrame({
+        'realized_vol_7': rng.lognormal(-0.5, 0.6, n),
+        'liquidity_score': rng.uniform(0, 100, n),
+        'sentiment_score': rng.uniform(0, 100, n),
+        'rsi': rng.uniform(10, 90, n)
+    }, index=pd.Index([f'coin-{i}' for i in range(n)], name='coin_id'))
+    
+    engine = CrossSectionalRiskEngine()
+    engine.set_weights('conservative', {'volatility': 0.5, 'liquidity': 0.4, 'momentum': 0.1})
+    
+    start = time.perf_counter()
+    scored = engine.score(snapshot)
+    all_sets = engine.score_all(snapshot)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    print(f"Scored {n} coins with {len(engine.weight_sets)} weight sets in {elapsed_ms:.1f}ms")
+    print(scored.sort_values('risk_rank').head())
+    print(all_sets.head())
@@ -0,0 +1,300 @@
+"""
+Asyncio counterparts of the CoinGecko and Binance extract clients.
+Many requests in flight per process over pooled keep-alive connections,
+capped by a semaphore and paced by the shared rate limiter.
+"""
+
+import asyncio
+from typing import Dict, List, Optional
+
+import aiohttp
+
+from source.extract_coingecko import CoinGeckoClient
+from source.extracts_binance import BinanceClient
+from source.rate_limit import (
+    RETRY_STATUS_CODES,
+    RateLimiter,
+    backoff_delay,
+    parse_retry_after,
+    shared_rate_limiter,
+)
+
+
+class _AsyncClient:
+    """Shared session, concurrency cap and rate-limited GET for async clients"""
+
+    BASE_URL = ""
+
+    def __init__(
+        self,
+        max_concurrency: int = 50,
+        rate_limiter: Optional[RateLimiter] = None,
+        base_url: Optional[str] = None,
+        headers: Optional[Dict[str, str]] = None,
+        max_retries: int = 3,
+        timeout: float = 10
+    ):
+        """
+        Initialize async client.
+
+        Args:
+            max_concurrency: Maximum requests in flight at once
+            rate_limiter: Rate limiter (default: shared process-wide limiter)
+            base_url: Override the API base URL (e.g. a local stub server)
+            headers: Extra headers sent with every request
+            max_retries: Retries for throttled responses
+            timeout: Total request timeout in seconds
+        """
+        self.base_url = base_url or self.BASE_URL
+        self.max_concurrency = max_concurrency
+        self.rate_limiter = rate_limiter or shared_rate_limiter
+        self.headers = headers or {}
+        self.max_retries = max_retries
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self.session: Optional[aiohttp.ClientSession] = None
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def __aenter__(self):
+        await self.open()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def open(self) -> None:
+        """Create the pooled keep-alive session"""
+        if self.session is None or self.session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.max_concurrency,
+                keepalive_timeout=30,
+                ttl_dns_cache=300
+            )
+            self.session = aiohttp.ClientSession(
+                connector=connector, headers=self.headers, timeout=self.timeout
+            )
+
+    async def close(self) -> None:
+        """Close the session and its connection pool"""
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    async def _get(self, endpoint: str, params: Optional[Dict] = None, weight: int = 1):
+        """
+        GET an endpoint through the rate limiter and return decoded JSON.
+
+        Raises:
+            aiohttp.ClientError: On HTTP errors after retries
+        """
+        await self.open()
+        # aiohttp rejects non-string query values
+        params = {k: str(v) for k, v in (params or {}).items()}
+
+        for attempt in range(self.max_retries + 1):
+            delay = self.rate_limiter.reserve(endpoint, weight)
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+            async with self._semaphore:
+                async with self.session.get(endpoint, params=params) as response:
+                    self.rate_limiter.observe(endpoint, response.status, response.headers)
+
+                    if response.status in RETRY_STATUS_CODES and attempt < self.max_retries:
+                        retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                        if retry_after is None:
+                            retry_after = backoff_delay(attempt)
+                    else:
+                        response.raise_for_status()
+                        return await response.json(content_type=None)
+
+            print(f"Throttled ({response.status}) on {endpoint}, retry {attempt + 1}/{self.max_retries}")
+            await asyncio.sleep(retry_after)
+
+
+class AsyncCoinGeckoClient(_AsyncClient):
+    """Async client for CoinGecko API v3"""
+
+    BASE_URL = CoinGeckoClient.BASE_URL
+
+    def __init__(self, api_key: Optional[str] = None, **kwargs):
+        """
+        Initialize async CoinGecko client.
+
+        Args:
+            api_key: Optional CoinGecko Pro API key
+            **kwargs: Passed to the shared async client (max_concurrency, ...)
+        """
+        headers = {"x-cg-pro-api-key": api_key} if api_key else None
+        super().__init__(headers=headers, **kwargs)
+        self.api_key = api_key
+
+    async def fetch_ohlcv(
+        self,
+        coin_id: str,
+        vs_currency: str = "usd",
+        days: int = 30,
+        interval: str = "daily"
+    ) -> List[List]:
+        """Fetch OHLCV data (see CoinGeckoClient.fetch_ohlcv)"""
+        endpoint = f"{self.base_url}/coins/{coin_id}/ohlc"
+        params = {
+            "vs_currency": vs_currency,
+            "days": days
+        }
+
+        try:
+            return await self._get(endpoint, params)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            print(f"Error fetching OHLCV for {coin_id}: {e}")
+            return []
+
+    async def fetch_metadata(self, coin_id: str) -> Dict:
+        """Fetch detailed metadata for a coin (see CoinGeckoClient.fetch_metadata)"""
+        endpoint = f"{self.base_url}/coins/{coin_id}"
+        params = {
+            "localization": "false",
+            "tickers": "false",
+            "community_data": "true",
+            "developer_data": "false"
+        }
+
+        try:
+            return await self._get(endpoint, params)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            print(f"Error fetching metadata for {coin_id}: {e}")
+            return {}
+
+    async def fetch_market_data(
+        self,
+        vs_currency: str = "usd",
+        per_page: int = 250,
+        page: int = 1
+    ) -> List[Dict]:
+        """Fetch market data for multiple coins (see CoinGeckoClient.fetch_market_data)"""
+        endpoint = f"{self.base_url}/coins/markets"
+        params = {
+            "vs_currency": vs_currency,
+            "order": "market_cap_desc",
+            "per_page": per_page,
+            "page": page,
+            "sparkline": "false",
+            "price_change_percentage": "24h,7d,30d"
+        }
+
+        try:
+            return await self._get(endpoint, params)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            print(f"Error fetching market data: {e}")
+            return []
+
+    async def fetch_trending(self) -> Dict:
+        """Fetch trending coins"""
+        endpoint = f"{self.base_url}/search/trending"
+
+        try:
+            return await self._get(endpoint)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            print(f"Error fetching trending: {e}")
+            return {}
+
+
+class AsyncBinanceClient(_AsyncClient):
+    """Async client for Binance Public API"""
+
+    BASE_URL = BinanceClient.BASE_URL
+
+    async def fetch_ticker_24h(self, symbol: Optional[str] = None) -> Dict:
+        """Fetch 24-hour ticker statistics (see BinanceClient.fetch_ticker_24h)"""
+        endpoint = f"{self.base_url}/ticker/24hr"
+        params = {}
+        if symbol:
+            params["symbol"] = symbol
+
+        try:
+            return await self._get(endpoint, params, weight=1 if symbol else 40)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            print(f"Error fetching 24h ticker: {e}")
+            return {} if symbol else []
+
+    async def fetch_orderbook(self, symbol: str, limit: int = 100) -> Dict:
+        """Fetch order book (see BinanceClient.fetch_orderbook)"""
+        endpoint = f"{self.base_url}/depth"
+        params = {
+            "symbol": symbol,
+            "limit": limit
+        }
+
+        try:
+            return await self._get(endpoint, params, weight=BinanceClient.orderbook_weight(limit))
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            print(f"Error fetching order book for {symbol}: {e}")
+            return {"bids": [], "asks": []}
+
+    async def fetch_recent_trades(self, symbol: str, limit: int = 500) -> List[Dict]:
+        """Fetch recent trades (see BinanceClient.fetch_recent_trades)"""
+        endpoint = f"{self.base_url}/trades"
+        params = {
+            "symbol": symbol,
+            "limit": limit
+        }
+
+        try:
+            return await self._get(endpoint, params)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            print(f"Error fetching trades for {symbol}: {e}")
+            return []
+
+    async def fetch_klines(
+        self,
+        symbol: str,
+        interval: str = "1h",
+        limit: int = 500,
+        start_time: Optional[int] = None,
+        end_time: Optional[int] = None
+    ) -> List[List]:
+        """Fetch kline/candlestick data (see BinanceClient.fetch_klines)"""
+        endpoint = f"{self.base_url}/klines"
+        params = {
+            "symbol": symbol,
+            "interval": interval,
+            "limit": limit
+        }
+        if start_time:
+            params["startTime"] = start_time
+        if end_time:
+            params["endTime"] = end_time
+
+        try:
+            return await self._get(endpoint, params)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            print(f"Error fetching klines for {symbol}: {e}")
+            return []
+
+    async def fetch_orderbooks(self, symbols: List[str], limit: int = 100) -> Dict[str, Dict]:
+        """
+        Fetch order books for many symbols concurrently.
+
+        Args:
+            symbols: Trading pairs
+            limit: Depth limit per book
+
+        Returns:
+            Dictionary of symbol -> order book
+        """
+        books = await asyncio.gather(*(self.fetch_orderbook(s, limit) for s in symbols))
+        return dict(zip(symbols, books))
+
+
+# Example usage
+if __name__ == "__main__":
+    async def main():
+        async with AsyncBinanceClient(max_concurrency=20) as client:
+            books = await client.fetch_orderbooks(["BTCUSDT", "ETHUSDT", "SOLUSDT"], limit=20)
+            for symbol, book in books.items():
+                print(f"{symbol}: {len(book.get('bids', []))} bids, {len(book.get('asks', []))} asks")
+
+        async with AsyncCoinGeckoClient() as client:
+            top_coins = await client.fetch_market_data(per_page=20)
+            print(f"Fetched {len(top_coins)} top coins")
+
+    asyncio.run(main())
@@ -3,23 +3,66 @@ CoinGecko API Client for extracting crypto market data.
 Fetches OHLCV, metadata, and market information.
 """
 
+import pandas as pd
 import requests
-from typing import Dict, List, Optional
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 from datetime import datetime, timedelta
 import time
 
+from source.decoding import decode_ohlcv
+from source.http_cache import ResponseCache
+from source.rate_limit import RateLimiter, backoff_delay, limited_get, parse_retry_after
+
 
 class CoinGeckoClient:
     """Client for CoinGecko API v3"""
     
     BASE_URL = "https://api.coingecko.com/api/v3"
     
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        max_workers: int = 8,
+        rate_limiter: Optional[RateLimiter] = None,
+        cache: Optional[ResponseCache] = None
+    ):
+        """
+        Initialize CoinGecko client.
+        
+        Args:
+            api_key: Optional CoinGecko Pro API key
+            max_workers: Worker threads used by the bulk fetch methods; the
+                session connection pool is sized to match
+            rate_limiter: Rate limiter (default: shared process-wide limiter)
+            cache: Response cache for slow-changing endpoints (None = no caching)
+        """
         self.api_key = api_key
+        self.max_workers = max_workers
+        self.rate_limiter = rate_limiter
+        self.cache = cache
         self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
         if api_key:
             self.session.headers.update({"x-cg-pro-api-key": api_key})
     
+    def _get(self, endpoint: str, params: Optional[Dict] = None, cache_as: Optional[str] = None):
+        """
+        GET an endpoint through the rate limiter and return decoded JSON.
+        
+        If cache_as names an endpoint with a TTL in the response cache, the
+        response is served from / stored in the cache.
+        """
+        if self.cache is not None and cache_as:
+            return self.cache.get_json(
+                self.session, endpoint, params, endpoint=cache_as, limiter=self.rate_limiter
+            )
+        response = limited_get(self.session, endpoint, params, limiter=self.rate_limiter)
+        return response.json()
+    
     def fetch_ohlcv(
         self, 
         coin_id: str, 
@@ -39,6 +82,29 @@ class CoinGeckoClient:
         Returns:
             List of [timestamp, open, high, low, close] arrays
         """
+        try:
+            return self._get_ohlcv(coin_id, vs_currency, days)
+        except requests.exceptions.RequestException as e:
+            print(f"Error fetching OHLCV for {coin_id}: {e}")
+            return []
+    
+    def fetch_ohlcv_columnar(
+        self,
+        coin_id: str,
+        vs_currency: str = "usd",
+        days: int = 30
+    ) -> pd.DataFrame:
+        """
+        Fetch OHLC data decoded straight into typed columns.
+        
+        Args:
+            coin_id: CoinGecko coin ID (e.g., 'bitcoin')
+            vs_currency: Target currency (default: 'usd')
+            days: Number of days of data
+        
+        Returns:
+            DataFrame with int64 timestamp (ms) and float64 open/high/low/close
+        """
         endpoint = f"{self.BASE_URL}/coins/{coin_id}/ohlc"
         params = {
             "vs_currency": vs_currency,
@@ -46,12 +112,19 @@ class CoinGeckoClient:
         }
         
         try:
-            response = self.session.get(endpoint, params=params, timeout=10)
-            response.raise_for_status()
-            return response.json()
+            response = limited_get(self.session, endpoint, params, limiter=self.rate_limiter)
+            return decode_ohlcv(response.content)
         except requests.exceptions.RequestException as e:
             print(f"Error fetching OHLCV for {coin_id}: {e}")
-            return []
+            return decode_ohlcv(b"[]")
+    
+    def _get_ohlcv(self, coin_id: str, vs_currency: str = "usd", days: int = 30) -> List[List]:
+        endpoint = f"{self.BASE_URL}/coins/{coin_id}/ohlc"
+        params = {
+            "vs_currency": vs_currency,
+            "days": days
+        }
+        return self._get(endpoint, params)
     
     def fetch_metadata(self, coin_id: str) -> Dict:
         """
@@ -66,6 +139,13 @@ class CoinGeckoClient:
             - market_cap, total_volume, prices
             - market_cap_rank, circulating_supply
         """
+        try:
+            return self._get_metadata(coin_id)
+        except requests.exceptions.RequestException as e:
+            print(f"Error fetching metadata for {coin_id}: {e}")
+            return {}
+    
+    def _get_metadata(self, coin_id: str) -> Dict:
         endpoint = f"{self.BASE_URL}/coins/{coin_id}"
         params = {
             "localization": "false",
@@ -73,14 +153,96 @@ class CoinGeckoClient:
             "community_data": "true",
             "developer_data": "false"
         }
+        return self._get(endpoint, params, cache_as="metadata")
+    
+    def fetch_ohlcv_many(
+        self,
+        coin_ids: Iterable[str],
+        vs_currency: str = "usd",
+        days: int = 30,
+        max_workers: Optional[int] = None
+    ) -> Iterator[Tuple[str, List[List], Optional[Exception]]]:
+        """
+        Fetch OHLCV data for many coins concurrently.
         
-        try:
-            response = self.session.get(endpoint, params=params, timeout=10)
-            response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
-            print(f"Error fetching metadata for {coin_id}: {e}")
-            return {}
+        Results are yielded as each request finishes, not in input order.
+        A failed coin does not stop the others; its error is reported in
+        the third tuple element and its data is an empty list.
+        
+        Args:
+            coin_ids: CoinGecko coin IDs
+            vs_currency: Target currency (default: 'usd')
+            days: Number of days of data
+            max_workers: Concurrent requests (default: client max_workers)
+        
+        Returns:
+            Iterator of (coin_id, ohlcv, error) tuples
+        """
+        return self._fetch_many(
+            lambda coin_id: self._get_ohlcv(coin_id, vs_currency, days),
+            coin_ids,
+            default=list,
+            max_workers=max_workers
+        )
+    
+    def fetch_metadata_many(
+        self,
+        coin_ids: Iterable[str],
+        max_workers: Optional[int] = None
+    ) -> Iterator[Tuple[str, Dict, Optional[Exception]]]:
+        """
+        Fetch metadata for many coins concurrently.
+        
+        Args:
+            coin_ids: CoinGecko coin IDs
+            max_workers: Concurrent requests (default: client max_workers)
+        
+        Returns:
+            Iterator of (coin_id, metadata, error) tuples, in completion order
+        """
+        return self._fetch_many(
+            self._get_metadata,
+            coin_ids,
+            default=dict,
+            max_workers=max_workers
+        )
+    
+    def _fetch_many(
+        self,
+        fetch: Callable,
+        keys: Iterable[str],
+        default: Callable,
+        max_workers: Optional[int] = None
+    ) -> Iterator[Tuple[str, object, Optional[Exception]]]:
+        """
+        Run fetch(key) for every key on a bounded thread pool.
+        
+        At most 2 * max_workers requests are queued at once, so arbitrarily
+        long key iterables never materialize a future per key up front.
+        """
+        max_workers = max_workers or self.max_workers
+        keys = iter(keys)
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            pending = {}
+            
+            def submit_next(n: int) -> None:
+                for key in keys:
+                    pending[executor.submit(fetch, key)] = key
+                    n -= 1
+                    if n <= 0:
+                        break
+            
+            submit_next(2 * max_workers)
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    key = pending.pop(future)
+                    try:
+                        yield key, future.result(), None
+                    except Exception as e:
+                        yield key, default(), e
+                submit_next(len(done))
     
     def fetch_market_data(
         self, 
@@ -110,9 +272,7 @@ class CoinGeckoClient:
         }
         
         try:
-            response = self.session.get(endpoint, params=params, timeout=10)
-            response.raise_for_status()
-            return response.json()
+            return self._get(endpoint, params)
         except requests.exceptions.RequestException as e:
             print(f"Error fetching market data: {e}")
             return []
@@ -122,23 +282,28 @@ class CoinGeckoClient:
         endpoint = f"{self.BASE_URL}/search/trending"
         
         try:
-            response = self.session.get(endpoint, timeout=10)
-            response.raise_for_status()
-            return response.json()
+            return self._get(endpoint, cache_as="trending")
         except requests.exceptions.RequestException as e:
             print(f"Error fetching trending: {e}")
             return {}
     
     def rate_limit_safe(self, func, *args, **kwargs):
-        """Execute function with rate limit handling"""
+        """
+        Execute function with rate limit handling.
+        
+        The fetch methods already go through the shared rate limiter; this
+        wrapper is for ad hoc callables that raise HTTPError on 429.
+        """
         max_retries = 3
         for attempt in range(max_retries):
             try:
                 return func(*args, **kwargs)
             except requests.exceptions.HTTPError as e:
-                if e.response.status_code == 429:  # Rate limit
-                    wait_time = (attempt + 1) * 2
-                    print(f"Rate limited. Waiting {wait_time}s...")
+                if e.response is not None and e.response.status_code == 429:  # Rate limit
+                    wait_time = parse_retry_after(e.response.headers.get("Retry-After"))
+                    if wait_time is None:
+                        wait_time = backoff_delay(attempt)
+                    print(f"Rate limited. Waiting {wait_time:.1f}s...")
                     time.sleep(wait_time)
                 else:
                     raise
@@ -161,3 +326,10 @@ if __name__ == "__main__":
     # Fetch top 20 coins
     top_coins = client.fetch_market_data(per_page=20)
     print(f"Fetched {len(top_coins)} top coins")
+    
+    # Fetch OHLCV for all top coins concurrently
+    failed = []
+    for coin_id, ohlc, error in client.fetch_ohlcv_many([c["id"] for c in top_coins], days=7):
+        if error is not None:
+            failed.append(coin_id)
+    print(f"Bulk OHLCV fetch: {len(top_coins) - len(failed)} ok, {len(failed)} failed")
@@ -3,19 +3,113 @@ Binance API Client for extracting order book, trade data, and real-time prices.
 Uses Binance public API (no authentication required for public endpoints).
 """
 
+import pandas as pd
 import requests
-from typing import Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, Optional, Tuple, Union
 from datetime import datetime
+from pathlib import Path
+import json
+import os
 import time
 
+from source.decoding import decode_klines, decode_trades
+from source.http_cache import ResponseCache
+from source.liquidity import compute_liquidity_metrics
+from source.rate_limit import RateLimiter, limited_get
+
+
+# Kline interval lengths in milliseconds ("1M" is an upper bound)
+INTERVAL_MS = {
+    "1m": 60_000,
+    "3m": 180_000,
+    "5m": 300_000,
+    "15m": 900_000,
+    "30m": 1_800_000,
+    "1h": 3_600_000,
+    "2h": 7_200_000,
+    "4h": 14_400_000,
+    "6h": 21_600_000,
+    "8h": 28_800_000,
+    "12h": 43_200_000,
+    "1d": 86_400_000,
+    "3d": 259_200_000,
+    "1w": 604_800_000,
+    "1M": 2_678_400_000,
+}
+
+
+def _to_ms(value: Union[int, datetime]) -> int:
+    """Convert a datetime (naive = UTC) or millisecond timestamp to ms"""
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            return int((value - datetime(1970, 1, 1)).total_seconds() * 1000)
+        return int(value.timestamp() * 1000)
+    return int(value)
+
 
 class BinanceClient:
     """Client for Binance Public API"""
     
     BASE_URL = "https://api.binance.us/api/v3"
+    MAX_KLINES = 1000
     
-    def __init__(self):
+    def __init__(
+        self,
+        rate_limiter: Optional[RateLimiter] = None,
+        cache: Optional[ResponseCache] = None,
+        order_books: Optional[Dict] = None
+    ):
+        """
+        Initialize Binance client.
+        
+        Args:
+            rate_limiter: Rate limiter (default: shared process-wide limiter)
+            cache: Response cache for slow-changing endpoints (None = no caching)
+            order_books: Live local order books keyed by symbol (e.g.
+                BinanceStreamIngestor.books); used instead of REST snapshots
+                when synced
+        """
         self.session = requests.Session()
+        self.rate_limiter = rate_limiter
+        self.cache = cache
+        self.order_books = order_books
+    
+    def _get(
+        self,
+        endpoint: str,
+        params: Optional[Dict] = None,
+        weight: int = 1,
+        cache_as: Optional[str] = None
+    ):
+        """GET an endpoint charged at the given request weight, return decoded JSON"""
+        if self.cache is not None and cache_as:
+            return self.cache.get_json(
+                self.session, endpoint, params, endpoint=cache_as,
+                limiter=self.rate_limiter, weight=weight
+            )
+        response = limited_get(
+            self.session, endpoint, params, limiter=self.rate_limiter, weight=weight
+        )
+        return response.json()
+    
+    def _get_raw(self, endpoint: str, params: Optional[Dict] = None, weight: int = 1) -> bytes:
+        """GET an endpoint and return the undecoded response body"""
+        response = limited_get(
+            self.session, endpoint, params, limiter=self.rate_limiter, weight=weight
+        )
+        return response.content
+    
+    @staticmethod
+    def orderbook_weight(limit: int) -> int:
+        """Request weight of /depth for a given limit (Binance.US schedule)"""
+        if limit <= 100:
+            return 1
+        if limit <= 500:
+            return 5
+        if limit <= 1000:
+            return 10
+        return 50
     
     def fetch_ticker_24h(self, symbol: Optional[str] = None) -> Dict:
         """
@@ -33,13 +127,33 @@ class BinanceClient:
             params["symbol"] = symbol
         
         try:
-            response = self.session.get(endpoint, params=params, timeout=10)
-            response.raise_for_status()
-            return response.json()
+            # All-symbol ticker is far more expensive than a single symbol
+            return self._get(endpoint, params, weight=1 if symbol else 40)
         except requests.exceptions.RequestException as e:
             print(f"Error fetching 24h ticker: {e}")
             return {} if symbol else []
     
+    def fetch_exchange_info(self, symbol: Optional[str] = None) -> Dict:
+        """
+        Fetch exchange trading rules and symbol information.
+        
+        Args:
+            symbol: Trading pair. If None, fetches all symbols.
+        
+        Returns:
+            Exchange info dictionary with a 'symbols' list
+        """
+        endpoint = f"{self.BASE_URL}/exchangeInfo"
+        params = {}
+        if symbol:
+            params["symbol"] = symbol
+        
+        try:
+            return self._get(endpoint, params, weight=10, cache_as="exchange_info")
+        except requests.exceptions.RequestException as e:
+            print(f"Error fetching exchange info: {e}")
+            return {}
+    
     def fetch_orderbook(self, symbol: str, limit: int = 100) -> Dict:
         """
         Fetch order book (market depth) for a trading pair.
@@ -58,9 +172,7 @@ class BinanceClient:
         }
         
         try:
-            response = self.session.get(endpoint, params=params, timeout=10)
-            response.raise_for_status()
-            return response.json()
+            return self._get(endpoint, params, weight=self.orderbook_weight(limit))
         except requests.exceptions.RequestException as e:
             print(f"Error fetching order book for {symbol}: {e}")
             return {"bids": [], "asks": []}
@@ -83,11 +195,74 @@ class BinanceClient:
         }
         
         try:
-            response = self.session.get(endpoint, params=params, timeout=10)
-            response.raise_for_status()
-            return response.json()
+            return self._get(endpoint, params)
+        except requests.exceptions.RequestException as e:
+            print(f"Error fetching trades for {symbol}: {e}")
+            return []
+    
+    def fetch_recent_trades_columnar(self, symbol: str, limit: int = 500) -> pd.DataFrame:
+        """
+        Fetch recent trades decoded straight into typed columns.
+        
+        Args:
+            symbol: Trading pair
+            limit: Number of trades (max 1000)
+        
+        Returns:
+            DataFrame with id, price, qty, quote_qty, timestamp (ms), is_buyer_maker
+        """
+        endpoint = f"{self.BASE_URL}/trades"
+        params = {
+            "symbol": symbol,
+            "limit": limit
+        }
+        
+        try:
+            return decode_trades(self._get_raw(endpoint, params))
         except requests.exceptions.RequestException as e:
             print(f"Error fetching trades for {symbol}: {e}")
+            return decode_trades(b"[]")
+    
+    def fetch_agg_trades(
+        self,
+        symbol: str,
+        from_id: Optional[int] = None,
+        start_time: Optional[int] = None,
+        end_time: Optional[int] = None,
+        limit: int = 500
+    ) -> List[Dict]:
+        """
+        Fetch compressed/aggregate trades.
+        
+        Unlike /trades, this endpoint can be paged with from_id, which makes
+        it usable for incremental extraction.
+        
+        Args:
+            symbol: Trading pair
+            from_id: Aggregate trade ID to fetch from (inclusive)
+            start_time: Start time in milliseconds
+            end_time: End time in milliseconds
+            limit: Number of trades (max 1000)
+        
+        Returns:
+            List of aggregate trades ({"a": id, "p": price, "q": qty, "T": time, ...})
+        """
+        endpoint = f"{self.BASE_URL}/aggTrades"
+        params = {
+            "symbol": symbol,
+            "limit": limit
+        }
+        if from_id is not None:
+            params["fromId"] = from_id
+        if start_time:
+            params["startTime"] = start_time
+        if end_time:
+            params["endTime"] = end_time
+        
+        try:
+            return self._get(endpoint, params)
+        except requests.exceptions.RequestException as e:
+            print(f"Error fetching aggregate trades for {symbol}: {e}")
             return []
     
     def fetch_klines(
@@ -123,25 +298,173 @@ class BinanceClient:
             params["endTime"] = end_time
         
         try:
-            response = self.session.get(endpoint, params=params, timeout=10)
-            response.raise_for_status()
-            return response.json()
+            return self._get(endpoint, params)
         except requests.exceptions.RequestException as e:
             print(f"Error fetching klines for {symbol}: {e}")
             return []
     
+    def fetch_klines_columnar(
+        self,
+        symbol: str,
+        interval: str = "1h",
+        limit: int = 500,
+        start_time: Optional[int] = None,
+        end_time: Optional[int] = None
+    ) -> pd.DataFrame:
+        """
+        Fetch klines decoded straight into typed columns.
+        
+        Same arguments as fetch_klines; the response body is parsed without
+        building per-candle Python lists.
+        
+        Returns:
+            DataFrame with int64 timestamp (open time, ms) and float64 OHLCV columns
+        """
+        endpoint = f"{self.BASE_URL}/klines"
+        params = {
+            "symbol": symbol,
+            "interval": interval,
+            "limit": limit
+        }
+        if start_time:
+            params["startTime"] = start_time
+        if end_time:
+            params["endTime"] = end_time
+        
+        try:
+            return decode_klines(self._get_raw(endpoint, params))
+        except requests.exceptions.RequestException as e:
+            print(f"Error fetching klines for {symbol}: {e}")
+            return decode_klines(b"[]")
+    
+    def backfill_klines(
+        self,
+        symbol: str,
+        interval: str,
+        start: Union[int, datetime],
+        end: Union[int, datetime],
+        cursor_path: Optional[str] = None,
+        max_workers: int = 4
+    ) -> Iterator[List]:
+        """
+        Backfill klines over an arbitrary time range.
+        
+        The range is split into MAX_KLINES-candle windows that are fetched
+        concurrently but yielded strictly in open_time order without
+        duplicates. If cursor_path is given, the end of every fully yielded
+        window is saved there, so a rerun of the same range after a crash
+        resumes from the last completed window (candles of a partially
+        consumed window are yielded again). The cursor is keyed by symbol,
+        interval and the requested range, and is deleted once the range
+        completes, so other ranges always start from their own beginning.
+        
+        Args:
+            symbol: Trading pair
+            interval: Kline interval (1m, 5m, 15m, 1h, 4h, 1d, 1w, 1M)
+            start: Range start (datetime or ms timestamp, inclusive)
+            end: Range end (datetime or ms timestamp, exclusive)
+            cursor_path: JSON file holding the resume cursor
+            max_workers: Windows fetched concurrently
+        
+        Returns:
+            Iterator of klines [open_time, open, high, low, close, volume, ...]
+        
+        Raises:
+            requests.exceptions.RequestException: If a window cannot be fetched;
+                the cursor still points at the last completed window
+        """
+        if interval not in INTERVAL_MS:
+            raise ValueError(f"Unsupported kline interval: {interval}")
+        
+        range_key = (symbol, interval, _to_ms(start), _to_ms(end))
+        start_ms, end_ms = range_key[2], range_key[3]
+        cursor = self._load_cursor(cursor_path, range_key)
+        if cursor is not None:
+            start_ms = max(start_ms, cursor)
+        
+        span = INTERVAL_MS[interval] * self.MAX_KLINES
+        windows = [(ws, min(ws + span, end_ms)) for ws in range(start_ms, end_ms, span)]
+        endpoint = f"{self.BASE_URL}/klines"
+        
+        def fetch_window(window):
+            params = {
+                "symbol": symbol,
+                "interval": interval,
+                "startTime": window[0],
+                "endTime": window[1] - 1,
+                "limit": self.MAX_KLINES
+            }
+            return self._get(endpoint, params)
+        
+        last_open_time = -1
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # Bounded look-ahead keeps memory flat on long ranges
+            futures = []
+            next_window = 0
+            for i, window in enumerate(windows):
+                while next_window < len(windows) and next_window <= i + max_workers:
+                    futures.append(executor.submit(fetch_window, windows[next_window]))
+                    next_window += 1
+                
+                for kline in futures[i].result():
+                    if last_open_time < kline[0] < window[1]:
+                        last_open_time = kline[0]
+                        yield kline
+                futures[i] = None
+                
+                self._save_cursor(cursor_path, range_key, window[1])
+        
+        if cursor_path:
+            Path(cursor_path).unlink(missing_ok=True)  # Range complete
+    
+    @staticmethod
+    def _load_cursor(cursor_path: Optional[str], range_key: Tuple[str, str, int, int]) -> Optional[int]:
+        if not cursor_path or not os.path.exists(cursor_path):
+            return None
+        with open(cursor_path, 'r', encoding='utf-8') as f:
+            cursor = json.load(f)
+        key = (cursor.get("symbol"), cursor.get("interval"), cursor.get("start"), cursor.get("end"))
+        if key != range_key:
+            return None
+        return cursor.get("next_start")
+    
+    @staticmethod
+    def _save_cursor(cursor_path: Optional[str], range_key: Tuple[str, str, int, int], next_start: int) -> None:
+        if not cursor_path:
+            return
+        symbol, interval, start, end = range_key
+        path = Path(cursor_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(path.suffix + ".tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                "symbol": symbol,
+                "interval": interval,
+                "start": start,
+                "end": end,
+                "next_start": next_start
+            }, f)
+        os.replace(tmp_path, path)  # Atomic: a crash never leaves a torn cursor
+    
     def compute_liquidity_score(self, symbol: str) -> float:
         """
         Compute a liquidity score based on order book depth.
         Higher score = better liquidity.
         
+        Reads the local streamed order book when one is attached and synced,
+        otherwise fetches a REST snapshot.
+        
         Args:
             symbol: Trading pair
         
         Returns:
             Liquidity score (0-100)
         """
-        orderbook = self.fetch_orderbook(symbol, limit=100)
+        local_book = self.order_books.get(symbol) if self.order_books else None
+        if local_book is not None and local_book.synced:
+            orderbook = local_book.to_dict(limit=20)
+        else:
+            orderbook = self.fetch_orderbook(symbol, limit=100)
         
         if not orderbook.get("bids") or not orderbook.get("asks"):
             return 0.0
@@ -161,6 +484,44 @@ class BinanceClient:
         spread_score = max(0, 50 - spread * 10)  # Lower spread is better
         
         return min(volume_score + spread_score, 100)
+    
+    def compute_liquidity_scores(
+        self,
+        symbols: List[str],
+        levels: int = 20,
+        notional: float = 10_000.0,
+        max_workers: int = 8
+    ) -> pd.DataFrame:
+        """
+        Compute liquidity metrics for many symbols at once.
+        
+        Local streamed books are used where synced; the remaining books are
+        fetched concurrently, then all are scored in one vectorized pass.
+        
+        Args:
+            symbols: Trading pairs
+            levels: Levels per side used for depth and slippage
+            notional: Order size (quote currency) for slippage estimates
+            max_workers: Concurrent REST snapshot requests
+        
+        Returns:
+            DataFrame indexed by symbol (see liquidity.compute_liquidity_metrics)
+        """
+        books = {}
+        to_fetch = []
+        for symbol in symbols:
+            local_book = self.order_books.get(symbol) if self.order_books else None
+            if local_book is not None and local_book.synced:
+                books[symbol] = local_book.to_dict(limit=levels)
+            else:
+                to_fetch.append(symbol)
+        
+        limit = next(l for l in (5, 10, 20, 50, 100, 500, 1000, 5000) if l >= min(levels, 5000))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for symbol, book in zip(to_fetch, executor.map(lambda s: self.fetch_orderbook(s, limit), to_fetch)):
+                books[symbol] = book
+        
+        return compute_liquidity_metrics({s: books[s] for s in symbols}, levels=levels, notional=notional)
 
 
 # Example usage
@@ -182,3 +543,10 @@ if __name__ == "__main__":
     # Fetch recent klines
     klines = client.fetch_klines("BTCUSDT", interval="1h", limit=24)
     print(f"Fetched {len(klines)} hourly klines")
+    
+    # Backfill a week of 1m klines, resumable via a cursor file
+    week = list(client.backfill_klines(
+        "BTCUSDT", "1m", datetime(2024, 1, 1), datetime(2024, 1, 8),
+        cursor_path="data/state/backfill_BTCUSDT_1m.json"
+    ))
+    print(f"Backfilled {len(week)} 1m klines")
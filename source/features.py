@@ -5,6 +5,7 @@ Computes rolling statistics, technical indicators, and derived metrics.
 
 import pandas as pd
 import numpy as np
+from pandas.api.indexers import BaseIndexer
 from typing import List, Optional
 
 
@@ -53,7 +54,9 @@ def compute_rolling_features(
 def compute_volatility_metrics(
     df: pd.DataFrame,
     price_col: str = "price",
-    windows: List[int] = [7, 14, 30]
+    windows: List[int] = [7, 14, 30],
+    normalizer: str = "full",
+    normalizer_window: Optional[int] = None
 ) -> pd.DataFrame:
     """
     Compute volatility metrics.
@@ -62,6 +65,11 @@ def compute_volatility_metrics(
         df: DataFrame with price data
         price_col: Name of price column
         windows: List of window sizes for calculations
+        normalizer: Reference quantile for volatility_score: 'full' (whole
+            series, changes as data arrives), 'expanding' (all rows up to
+            each row) or 'rolling' (last normalizer_window rows). The causal
+            modes never rescore past rows when new data is appended.
+        normalizer_window: Window size for the 'rolling' normalizer
     
     Returns:
         DataFrame with volatility metrics
@@ -85,7 +93,8 @@ def compute_volatility_metrics(
     if f"realized_vol_{windows[0]}" in df.columns:
         vol = df[f"realized_vol_{windows[0]}"]
         # Normalize to 0-100 (higher vol = higher score)
-        df["volatility_score"] = np.clip((vol / vol.quantile(0.95)) * 100, 0, 100)
+        vol_q95 = _quantile_reference(vol, np.zeros(len(vol), dtype=np.int64), normalizer, normalizer_window)
+        df["volatility_score"] = np.clip((vol / vol_q95) * 100, 0, 100)
     
     return df
 
@@ -123,13 +132,23 @@ def compute_momentum_indicators(
     return df
 
 
-def compute_drawdown(df: pd.DataFrame, price_col: str = "price") -> pd.DataFrame:
+def compute_drawdown(
+    df: pd.DataFrame,
+    price_col: str = "price",
+    mdd_windows: Optional[List[int]] = None
+) -> pd.DataFrame:
     """
     Compute drawdown metrics.
     
+    max_drawdown_30d is the lowest all-time drawdown seen in the last 30
+    rows, so it still measures from the all-time peak. mdd_windows adds
+    window_mdd_{w} columns: the true peak-to-trough drawdown within the
+    last w rows, measured from peaks inside that window only.
+    
     Args:
         df: DataFrame with price data
         price_col: Name of price column
+        mdd_windows: Window sizes (in periods) for window_mdd_{w} columns
     
     Returns:
         DataFrame with drawdown metrics
@@ -145,6 +164,12 @@ def compute_drawdown(df: pd.DataFrame, price_col: str = "price") -> pd.DataFrame
     # Maximum drawdown (rolling)
     df["max_drawdown_30d"] = df["drawdown"].rolling(window=30, min_periods=1).min()
     
+    # Windowed maximum drawdown
+    for window in mdd_windows or []:
+        df[f"window_mdd_{window}"] = _windowed_max_drawdown(
+            df[price_col].to_numpy(dtype=np.float64), window
+        )
+    
     return df
 
 
@@ -221,6 +246,426 @@ def compute_liquidity_proxy(
     return df
 
 
+class _GroupWindowIndexer(BaseIndexer):
+    """
+    Trailing fixed-size windows that never cross a group boundary.
+    
+    Expects rows sorted so each group is contiguous and a per-row array
+    group_start holding the position of the group's first row. Bounds for
+    all rows are computed in one vectorized step.
+    """
+    
+    def get_window_bounds(self, num_values=0, min_periods=None, center=None, closed=None, step=None):
+        end = np.arange(1, num_values + 1, dtype=np.int64)
+        start = np.maximum(end - self.window_size, self.group_start).astype(np.int64)
+        return start, end
+
+
+def _group_starts(keys: pd.Series) -> np.ndarray:
+    """Position of each row's group start, for rows sorted by group"""
+    codes = pd.factorize(keys)[0]
+    positions = np.arange(len(codes))
+    is_start = np.r_[True, codes[1:] != codes[:-1]] if len(codes) else np.zeros(0, bool)
+    return np.maximum.accumulate(np.where(is_start, positions, 0))
+
+
+def _grouped_rolling(
+    series: pd.Series,
+    group_start: np.ndarray,
+    window: int,
+    stat: str,
+    min_periods: Optional[int] = None,
+    other: Optional[pd.Series] = None
+) -> np.ndarray:
+    """
+    Rolling statistic computed independently per group.
+    
+    Same semantics as series.rolling(window, min_periods) on each group
+    (min_periods defaults to window), returned as a positionally aligned array.
+    """
+    indexer = _GroupWindowIndexer(window_size=window, group_start=group_start)
+    rolling = series.rolling(indexer, min_periods=window if min_periods is None else min_periods)
+    result = getattr(rolling, stat)(other) if other is not None else getattr(rolling, stat)()
+    return result.to_numpy()
+
+
+def _grouped_ewm_mean(series: pd.Series, keys: pd.Series, span: int) -> np.ndarray:
+    """Per-group ewm(span, adjust=False).mean(), positionally aligned"""
+    return series.groupby(keys, sort=False).ewm(span=span, adjust=False).mean().to_numpy()
+
+
+def _windowed_max_drawdown(
+    price: np.ndarray,
+    window: int,
+    group_start: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """
+    Maximum drawdown (in percent, <= 0) inside each trailing window of rows.
+    
+    Rows are split into blocks of `window` rows aligned to each group's
+    start. Every trailing window is then a suffix of one block joined to a
+    prefix of the next (van Herk/Gil-Werman), and a segment's
+    (max, min, max drawdown) combine as
+    mdd = min(mdd_left, mdd_right, min_right / max_left - 1).
+    Prefix and suffix scans are grouped cumulative max/min, so the whole
+    computation is O(n) per window regardless of its size. Windows never
+    cross a group boundary and are truncated at the group start
+    (min_periods=1).
+    """
+    n = len(price)
+    if group_start is None:
+        group_start = np.zeros(n, dtype=np.int64)
+    positions = np.arange(n)
+    offset = positions - group_start
+    block = pd.Series(group_start + (offset // window) * window)
+    p = pd.Series(price)
+    
+    prefix_max = p.groupby(block, sort=False).cummax().to_numpy()
+    prefix_min = p.groupby(block, sort=False).cummin().to_numpy()
+    prefix_mdd = pd.Series(price / prefix_max - 1).groupby(block, sort=False).cummin().to_numpy()
+    
+    rp, rblock = p[::-1].reset_index(drop=True), block[::-1].reset_index(drop=True)
+    suffix_max = rp.groupby(rblock, sort=False).cummax().to_numpy()[::-1]
+    suffix_min = rp.groupby(rblock, sort=False).cummin().to_numpy()[::-1]
+    suffix_mdd = pd.Series(suffix_min / price - 1)[::-1].reset_index(drop=True)
+    suffix_mdd = suffix_mdd.groupby(rblock, sort=False).cummin().to_numpy()[::-1]
+    
+    # Window start; a window ending on a block's last row (or inside a
+    # group's first block) is exactly that block's prefix
+    start = np.maximum(positions - window + 1, group_start)
+    prefix_only = (offset < window) | (offset % window == window - 1)
+    s = np.where(prefix_only, positions, start)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        joined = np.minimum(
+            np.minimum(suffix_mdd[s], prefix_mdd),
+            prefix_min / suffix_max[s] - 1
+        )
+    return np.where(prefix_only, prefix_mdd, joined) * 100
+
+
+def _quantile_reference(
+    values: pd.Series,
+    group_start: np.ndarray,
+    normalizer: str = "full",
+    window: Optional[int] = None,
+    q: float = 0.95
+) -> np.ndarray:
+    """
+    Per-row reference quantile used to scale scores to 0-100.
+    
+    'full' uses each group's whole series, 'expanding' every row of the
+    group up to and including the current one, 'rolling' the last
+    `window` rows of the group.
+    """
+    if normalizer == "full":
+        keys = pd.Series(group_start, index=values.index)
+        return values.groupby(keys, sort=False).transform("quantile", q).to_numpy()
+    if normalizer == "expanding":
+        window = max(len(values), 1)
+    elif normalizer == "rolling":
+        if not window:
+            raise ValueError("normalizer='rolling' requires normalizer_window")
+    else:
+        raise ValueError(f"Unknown normalizer: {normalizer}")
+    indexer = _GroupWindowIndexer(window_size=window, group_start=group_start)
+    return values.rolling(indexer, min_periods=1).quantile(q).to_numpy()
+
+
+def compute_panel_features(
+    df: pd.DataFrame,
+    coin_col: str = "coin_id",
+    timestamp_col: str = "timestamp",
+    windows: List[int] = [7, 14, 30],
+    price_col: str = "price",
+    volume_col: str = "volume",
+    float_dtype: str = "float64",
+    mdd_windows: Optional[List[int]] = None,
+    normalizer: str = "full",
+    normalizer_window: Optional[int] = None
+) -> pd.DataFrame:
+    """
+    Compute the full feature chain for many coins at once.
+    
+    Takes one long DataFrame keyed by (coin_id, timestamp) and computes the
+    same columns as running compute_rolling_features,
+    compute_volatility_metrics, compute_momentum_indicators,
+    compute_drawdown, compute_volume_features and compute_liquidity_proxy
+    on each coin separately. Every window, shift, EWM and quantile is
+    evaluated per coin with grouped vectorized operations, so no value
+    leaks across coin boundaries.
+    
+    Args:
+        df: Long DataFrame with coin, timestamp, price (and optional volume,
+            high, low) columns
+        coin_col: Name of coin identifier column
+        timestamp_col: Name of timestamp column
+        windows: List of rolling window sizes (in periods)
+        price_col: Name of price column
+        volume_col: Name of volume column
+        float_dtype: Storage dtype of the feature columns ('float32' for the
+            compact memory mode); computation is always float64
+        mdd_windows: Window sizes for window_mdd_{w} columns (peak-to-trough
+            within the window; max_drawdown_30d measures from the all-time peak)
+        normalizer: Reference quantile for volatility_score, see
+            compute_volatility_metrics
+        normalizer_window: Window size for the 'rolling' normalizer
+    
+    Returns:
+        DataFrame sorted by (coin, timestamp) with all feature columns added
+    """
+    df = df.sort_values([coin_col, timestamp_col], kind="stable")
+    keys = df[coin_col]
+    starts = _group_starts(keys)
+    price = df[price_col]
+    by_coin = price.groupby(keys, sort=False)
+    out = {}
+    
+    # Rolling features
+    for window in windows:
+        ma = _grouped_rolling(price, starts, window, "mean", min_periods=1)
+        out[f"ma_{window}"] = ma
+        out[f"std_{window}"] = _grouped_rolling(price, starts, window, "std", min_periods=1)
+        out[f"return_{window}"] = by_coin.pct_change(periods=window).to_numpy()
+        out[f"min_{window}"] = _grouped_rolling(price, starts, window, "min", min_periods=1)
+        out[f"max_{window}"] = _grouped_rolling(price, starts, window, "max", min_periods=1)
+        out[f"ma_distance_{window}"] = (price.to_numpy() - ma) / ma
+    
+    # Volatility metrics
+    log_return = np.log(price / by_coin.shift(1))
+    out["log_return"] = log_return.to_numpy()
+    for window in windows:
+        out[f"realized_vol_{window}"] = _grouped_rolling(log_return, starts, window, "std") * np.sqrt(365)
+        if "high" in df.columns and "low" in df.columns:
+            hl = np.log(df["high"] / df["low"]) ** 2
+            out[f"parkinson_vol_{window}"] = np.sqrt(
+                _grouped_rolling(hl, starts, window, "mean") / (4 * np.log(2))
+            ) * np.sqrt(365)
+    vol = pd.Series(out[f"realized_vol_{windows[0]}"], index=df.index)
+    vol_q95 = _quantile_reference(vol, starts, normalizer, normalizer_window)
+    out["volatility_score"] = np.clip((vol / vol_q95) * 100, 0, 100).to_numpy()
+    
+    # Momentum indicators
+    delta = by_coin.diff()
+    gain = _grouped_rolling(delta.where(delta > 0, 0), starts, 14, "mean")
+    loss = _grouped_rolling(-delta.where(delta < 0, 0), starts, 14, "mean")
+    out["rsi"] = 100 - (100 / (1 + gain / loss))
+    macd = _grouped_ewm_mean(price, keys, 12) - _grouped_ewm_mean(price, keys, 26)
+    macd_signal = _grouped_ewm_mean(pd.Series(macd, index=df.index), keys, 9)
+    out["macd"] = macd
+    out["macd_signal"] = macd_signal
+    out["macd_histogram"] = macd - macd_signal
+    
+    # Drawdown
+    running_max = by_coin.cummax()
+    drawdown = (price - running_max) / running_max * 100
+    out["running_max"] = running_max.to_numpy()
+    out["drawdown"] = drawdown.to_numpy()
+    out["max_drawdown_30d"] = _grouped_rolling(drawdown, starts, 30, "min", min_periods=1)
+    for window in mdd_windows or []:
+        out[f"window_mdd_{window}"] = _windowed_max_drawdown(price.to_numpy(dtype=np.float64), window, starts)
+    
+    # Volume features and liquidity proxy
+    if volume_col in df.columns:
+        volume = df[volume_col]
+        volume_ma_30 = _grouped_rolling(volume, starts, 30, "mean", min_periods=1)
+        out["volume_ma_7"] = _grouped_rolling(volume, starts, 7, "mean", min_periods=1)
+        out["volume_ma_30"] = volume_ma_30
+        out["volume_ratio"] = volume.to_numpy() / volume_ma_30
+        out["price_volume_corr"] = _grouped_rolling(price, starts, 30, "corr", other=volume)
+        obv_step = pd.Series(np.sign(delta.to_numpy()) * volume.to_numpy(), index=df.index)
+        out["obv"] = obv_step.groupby(keys, sort=False).cumsum().to_numpy()
+        
+        volume_std = _grouped_rolling(volume, starts, 30, "std")
+        volume_stability = 1 - pd.Series(volume_std / volume_ma_30).fillna(0).to_numpy()
+        volume_q95 = volume.groupby(keys, sort=False).transform("quantile", 0.95).to_numpy()
+        volume_score = np.clip((volume.to_numpy() / volume_q95) * 50, 0, 50)
+        stability_score = np.clip(volume_stability * 50, 0, 50)
+        out["liquidity_score"] = volume_score + stability_score
+    else:
+        out["liquidity_score"] = np.full(len(df), 50)
+    
+    features = pd.DataFrame(
+        {name: np.asarray(values, dtype=float_dtype) for name, values in out.items()},
+        index=df.index
+    )
+    return pd.concat([df.drop(columns=[c for c in out if c in df.columns]), features], axis=1)
+
+
+FEATURE_GROUPS = ["rolling", "volatility", "momentum", "drawdown", "volume", "liquidity"]
+
+
+class FeaturePipeline:
+    """
+    Single-pass feature computation for one coin's time series.
+    
+    Produces the same columns as chaining the compute_* functions, but
+    shares intermediates between features (one Rolling object per window,
+    one log-return and one price-diff series), writes every feature into a
+    preallocated float64 matrix and builds the output frame once instead of
+    copying the growing frame at every step.
+    """
+    
+    def __init__(
+        self,
+        features: List[str] = FEATURE_GROUPS,
+        windows: List[int] = [7, 14, 30],
+        price_col: str = "price",
+        volume_col: str = "volume",
+        float_dtype: str = "float64"
+    ):
+        """
+        Initialize feature pipeline.
+        
+        Args:
+            features: Feature groups to compute, any of FEATURE_GROUPS
+            windows: Rolling window sizes for the rolling/volatility groups
+            price_col: Name of price column
+            volume_col: Name of volume column
+            float_dtype: Storage dtype of the feature columns; 'float32'
+                halves their memory (see transform_cleaning.optimize_dtypes
+                for accuracy bounds). Computation is always float64.
+        """
+        unknown = set(features) - set(FEATURE_GROUPS)
+        if unknown:
+            raise ValueError(f"Unknown feature groups: {sorted(unknown)}")
+        # Keep the canonical order so output columns match the chained functions
+        self.features = [f for f in FEATURE_GROUPS if f in features]
+        self.windows = list(windows)
+        self.price_col = price_col
+        self.volume_col = volume_col
+        self.float_dtype = float_dtype
+    
+    def output_columns(self, df: pd.DataFrame) -> List[str]:
+        """Names of the columns the pipeline will add for this frame"""
+        has_volume = self.volume_col in df.columns
+        columns = []
+        for group in self.features:
+            if group == "rolling":
+                for w in self.windows:
+                    columns += [f"ma_{w}", f"std_{w}", f"return_{w}", f"min_{w}", f"max_{w}", f"ma_distance_{w}"]
+            elif group == "volatility":
+                columns.append("log_return")
+                for w in self.windows:
+                    columns.append(f"realized_vol_{w}")
+                    if "high" in df.columns and "low" in df.columns:
+                        columns.append(f"parkinson_vol_{w}")
+                columns.append("volatility_score")
+            elif group == "momentum":
+                columns += ["rsi", "macd", "macd_signal", "macd_histogram"]
+            elif group == "drawdown":
+                columns += ["running_max", "drawdown", "max_drawdown_30d"]
+            elif group == "volume" and has_volume:
+                columns += ["volume_ma_7", "volume_ma_30", "volume_ratio", "price_volume_corr", "obv"]
+            elif group == "liquidity":
+                columns.append("liquidity_score")
+        return columns
+    
+    def run(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Compute all configured features.
+        
+        Args:
+            df: DataFrame with price (and optional volume, high, low) data
+        
+        Returns:
+            New DataFrame with the input columns followed by feature columns
+        """
+        if self.price_col not in df.columns:
+            print(f"Warning: {self.price_col} not found in DataFrame")
+            return df.copy()
+        
+        columns = self.output_columns(df)
+        slot = {name: i for i, name in enumerate(columns)}
+        values = np.empty((len(df), len(columns)), dtype=self.float_dtype)
+        
+        def put(name, data):
+            values[:, slot[name]] = data
+        
+        price = df[self.price_col]
+        p = price.to_numpy(dtype=np.float64)
+        rolling = {}
+        
+        def price_rolling(window: int):
+            if window not in rolling:
+                rolling[window] = price.rolling(window=window, min_periods=1)
+            return rolling[window]
+        
+        log_return = None
+        if "volatility" in self.features:
+            log_return = np.log(price / price.shift(1))
+        diff = price.diff() if {"momentum", "volume"} & set(self.features) else None
+        
+        volume = df[self.volume_col] if self.volume_col in df.columns else None
+        volume_rolling_30 = volume.rolling(window=30, min_periods=1) if volume is not None else None
+        
+        if "rolling" in self.features:
+            for w in self.windows:
+                r = price_rolling(w)
+                ma = r.mean().to_numpy()
+                put(f"ma_{w}", ma)
+                put(f"std_{w}", r.std())
+                put(f"return_{w}", price.pct_change(periods=w))
+                put(f"min_{w}", r.min())
+                put(f"max_{w}", r.max())
+                put(f"ma_distance_{w}", (p - ma) / ma)
+        
+        if "volatility" in self.features:
+            put("log_return", log_return)
+            hl = None
+            if "high" in df.columns and "low" in df.columns:
+                hl = np.log(df["high"] / df["low"]) ** 2
+            realized_vol = {}
+            for w in self.windows:
+                realized_vol[w] = log_return.rolling(window=w).std() * np.sqrt(365)
+                put(f"realized_vol_{w}", realized_vol[w])
+                if hl is not None:
+                    put(f"parkinson_vol_{w}", np.sqrt(hl.rolling(window=w).mean() / (4 * np.log(2))) * np.sqrt(365))
+            vol = realized_vol[self.windows[0]]
+            put("volatility_score", np.clip((vol / vol.quantile(0.95)) * 100, 0, 100))
+        
+        if "momentum" in self.features:
+            gain = diff.where(diff > 0, 0).rolling(window=14).mean()
+            loss = (-diff.where(diff < 0, 0)).rolling(window=14).mean()
+            put("rsi", 100 - (100 / (1 + gain / loss)))
+            macd = price.ewm(span=12, adjust=False).mean() - price.ewm(span=26, adjust=False).mean()
+            macd_signal = macd.ewm(span=9, adjust=False).mean()
+            put("macd", macd)
+            put("macd_signal", macd_signal)
+            put("macd_histogram", macd - macd_signal)
+        
+        if "drawdown" in self.features:
+            running_max = price.cummax()
+            drawdown = (price - running_max) / running_max * 100
+            put("running_max", running_max)
+            put("drawdown", drawdown)
+            put("max_drawdown_30d", drawdown.rolling(window=30, min_periods=1).min())
+        
+        volume_ma_30 = None
+        if volume is not None and ("volume" in self.features or "liquidity" in self.features):
+            volume_ma_30 = volume_rolling_30.mean()
+        
+        if "volume" in self.features and volume is not None:
+            put("volume_ma_7", volume.rolling(window=7, min_periods=1).mean())
+            put("volume_ma_30", volume_ma_30)
+            put("volume_ratio", volume / volume_ma_30)
+            put("price_volume_corr", price.rolling(window=30).corr(volume))
+            put("obv", (np.sign(diff) * volume).cumsum())
+        
+        if "liquidity" in self.features:
+            if volume is None:
+                put("liquidity_score", 50)
+            else:
+                # rolling(30).std() has min_periods=30, unlike the shared min_periods=1 object
+                volume_stability = 1 - (volume.rolling(window=30).std() / volume_ma_30).fillna(0)
+                volume_score = np.clip((volume / volume.quantile(0.95)) * 50, 0, 50)
+                stability_score = np.clip(volume_stability * 50, 0, 50)
+                put("liquidity_score", volume_score + stability_score)
+        
+        features = pd.DataFrame(values, columns=columns, index=df.index, copy=False)
+        base = df.drop(columns=[c for c in columns if c in df.columns])
+        return pd.concat([base, features], axis=1)
+
+
 # Example usage
 if __name__ == "__main__":
     # Generate sample price data
@@ -246,7 +691,25 @@ if __name__ == "__main__":
     df = compute_liquidity_proxy(df)
     
     print("After feature engineering:", df.shape)
+    
+    # Same features in a single pass
+    pipeline = FeaturePipeline(windows=[7, 14, 30])
+    fused = pipeline.run(df[["timestamp", "price", "volume"]])
+    print("Fused pipeline:", fused.shape)
     print("\nFeatures added:")
     print(df.columns.tolist())
     print("\nSample data:")
     print(df[["timestamp", "price", "volatility_score", "liquidity_score", "rsi"]].tail())
+    
+    # Panel mode: many coins in one long frame
+    panel = pd.concat([
+        pd.DataFrame({
+            "coin_id": f"coin-{i}",
+            "timestamp": dates,
+            "price": 100 + np.cumsum(np.random.randn(100)),
+            "volume": np.random.randint(1e6, 5e6, size=100)
+        })
+        for i in range(50)
+    ], ignore_index=True)
+    panel_features = compute_panel_features(panel, windows=[7, 14, 30])
+    print("\nPanel features:", panel_features.shape)
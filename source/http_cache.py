@@ -0,0 +1,208 @@
+"""
+Response cache for the extract clients.
+In-memory LRU with per-endpoint TTLs, optional on-disk persistence, and
+ETag/Last-Modified revalidation so slow-changing data does not spend
+rate-limit budget on every call.
+"""
+
+import copy
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import requests
+
+from source.rate_limit import RateLimiter, limited_get
+
+
+# Seconds a cached response is served without contacting the server
+DEFAULT_TTLS = {
+    "metadata": 6 * 3600,       # CoinGecko /coins/{id}
+    "trending": 10 * 60,        # CoinGecko /search/trending
+    "exchange_info": 3600,      # Binance /exchangeInfo
+}
+
+
+class ResponseCache:
+    """Thread-safe LRU cache of decoded JSON responses"""
+
+    def __init__(
+        self,
+        max_entries: int = 2048,
+        ttls: Optional[Dict[str, float]] = None,
+        disk_path: Optional[str] = None
+    ):
+        """
+        Initialize response cache.
+
+        Args:
+            max_entries: In-memory LRU capacity
+            ttls: Seconds to keep each endpoint fresh, keyed by endpoint name
+                (merged over DEFAULT_TTLS); endpoints without a TTL are not cached
+            disk_path: Directory for the on-disk store (None = memory only)
+        """
+        self.max_entries = max_entries
+        self.ttls = dict(DEFAULT_TTLS)
+        if ttls:
+            self.ttls.update(ttls)
+        self.disk_path = Path(disk_path) if disk_path else None
+        if self.disk_path:
+            self.disk_path.mkdir(parents=True, exist_ok=True)
+        self._entries: "OrderedDict[str, Dict]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(url: str, params: Optional[Dict] = None) -> str:
+        """Cache key for a URL and query parameters"""
+        query = "&".join(f"{k}={v}" for k, v in sorted((params or {}).items()))
+        return f"{url}?{query}"
+
+    def _disk_file(self, key: str) -> Path:
+        return self.disk_path / (hashlib.sha1(key.encode()).hexdigest() + ".json")
+
+    def lookup(self, key: str) -> Optional[Dict]:
+        """Get a cache entry (fresh or stale) from memory, then disk"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return entry
+
+        if self.disk_path:
+            disk_file = self._disk_file(key)
+            if disk_file.exists():
+                try:
+                    with open(disk_file, 'r', encoding='utf-8') as f:
+                        entry = json.load(f)
+                except (OSError, ValueError):
+                    return None
+                self._remember(key, entry)
+                return entry
+        return None
+
+    def store(self, key: str, entry: Dict) -> None:
+        """
+        Put an entry in memory and, if enabled, on disk.
+
+        A failed disk write is reported and the in-memory entry kept, so a
+        full or read-only disk never loses a response already fetched.
+        """
+        self._remember(key, entry)
+        if self.disk_path:
+            disk_file = self._disk_file(key)
+            # Unique per writer so concurrent stores of one key never share a temp file
+            tmp_file = disk_file.with_name(f"{disk_file.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            try:
+                with open(tmp_file, 'w', encoding='utf-8') as f:
+                    json.dump(entry, f)
+                os.replace(tmp_file, disk_file)
+            except OSError as e:
+                print(f"✗ Error writing cache entry: {e}")
+                try:
+                    os.remove(tmp_file)
+                except OSError:
+                    pass
+
+    def _remember(self, key: str, entry: Dict) -> None:
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all in-memory entries (the disk store is left intact)"""
+        with self._lock:
+            self._entries.clear()
+
+    def get_json(
+        self,
+        session: requests.Session,
+        url: str,
+        params: Optional[Dict] = None,
+        endpoint: str = "",
+        limiter: Optional[RateLimiter] = None,
+        weight: float = 1
+    ) -> Any:
+        """
+        GET a JSON endpoint through the cache.
+
+        Fresh entries are served without a request. Stale entries with an
+        ETag or Last-Modified validator are revalidated with a conditional
+        request; a 304 refreshes the entry without downloading the body.
+
+        Args:
+            session: Pooled requests session
+            url: Endpoint URL
+            params: Query parameters
+            endpoint: Endpoint name used to look up the TTL
+            limiter: Rate limiter passed to limited_get
+            weight: Request weight
+
+        Returns:
+            Decoded JSON body; a copy, so callers may mutate it without
+            changing what later calls receive
+
+        Raises:
+            requests.exceptions.RequestException: On HTTP errors
+        """
+        ttl = self.ttls.get(endpoint, 0)
+        if ttl <= 0:
+            return limited_get(session, url, params, limiter=limiter, weight=weight).json()
+
+        key = self.make_key(url, params)
+        entry = self.lookup(key)
+        now = time.time()
+
+        if entry is not None and entry["expires"] > now:
+            with self._lock:
+                self.hits += 1
+            return copy.deepcopy(entry["data"])
+
+        headers = {}
+        if entry is not None:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+
+        response = limited_get(
+            session, url, params, limiter=limiter, weight=weight, headers=headers or None
+        )
+
+        if response.status_code == 304 and entry is not None:
+            with self._lock:
+                self.revalidated += 1
+            entry = dict(entry, expires=now + ttl)
+        else:
+            with self._lock:
+                self.misses += 1
+            entry = {
+                "data": response.json(),
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+                "expires": now + ttl,
+            }
+
+        self.store(key, entry)
+        return copy.deepcopy(entry["data"])
+
+
+# Example usage
+if __name__ == "__main__":
+    from source.extract_coingecko import CoinGeckoClient
+
+    cache = ResponseCache(disk_path="data/cache/http")
+    client = CoinGeckoClient(cache=cache)
+
+    for _ in range(3):
+        client.fetch_metadata("bitcoin")
+    print(f"Cache: {cache.hits} hits, {cache.revalidated} revalidated, {cache.misses} misses")
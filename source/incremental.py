@@ -0,0 +1,162 @@
+"""
+Incremental extraction state.
+Per-(source, symbol, interval) high-water marks stored in a small JSON file
+under the loader base path, plus helpers that fetch only data newer than the
+stored mark.
+"""
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from source.extracts_binance import BinanceClient
+
+
+class WatermarkStore:
+    """JSON-backed high-water marks keyed by (source, symbol, interval)"""
+
+    def __init__(self, base_path: str = "data", path: str = "state/watermarks.json"):
+        """
+        Initialize watermark store.
+
+        Args:
+            base_path: Data root, the same base_path given to LocalLoader
+            path: State file relative to base_path
+        """
+        self.path = Path(base_path) / path
+        self._lock = threading.Lock()
+        self._marks: Dict[str, int] = {}
+        if self.path.exists():
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self._marks = json.load(f)
+
+    @staticmethod
+    def _key(source: str, symbol: str, interval: Optional[str]) -> str:
+        return f"{source}:{symbol}:{interval or '-'}"
+
+    def get(self, source: str, symbol: str, interval: Optional[str] = None) -> Optional[int]:
+        """
+        Get the high-water mark for a stream.
+
+        Args:
+            source: Data source (e.g. 'binance')
+            symbol: Trading pair or coin ID
+            interval: Kline interval, or None for non-interval streams (trades)
+
+        Returns:
+            Stored mark (ms timestamp or trade ID), or None if never extracted
+        """
+        with self._lock:
+            return self._marks.get(self._key(source, symbol, interval))
+
+    def update(self, source: str, symbol: str, interval: Optional[str], value: int) -> None:
+        """
+        Advance a high-water mark and persist the store.
+
+        Marks only move forward; call this after the extracted data has been
+        written so a failed write is re-extracted on the next run.
+        """
+        key = self._key(source, symbol, interval)
+        with self._lock:
+            if value <= self._marks.get(key, value - 1):
+                return
+            self._marks[key] = int(value)
+            self._save()
+
+    def _save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._marks, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+
+def extract_new_klines(
+    client: BinanceClient,
+    store: WatermarkStore,
+    symbol: str,
+    interval: str = "1h",
+    lookback_ms: int = 7 * 86_400_000
+) -> Tuple[List[List], Optional[int]]:
+    """
+    Fetch closed klines newer than the stored watermark.
+
+    The still-open candle is never returned, so the watermark always points
+    at the open_time of the first candle not yet extracted.
+
+    Args:
+        client: Binance client
+        store: Watermark store
+        symbol: Trading pair
+        interval: Kline interval
+        lookback_ms: History to fetch when no watermark exists yet
+
+    Returns:
+        (new klines, new watermark); watermark is None if nothing new
+    """
+    now_ms = int(time.time() * 1000)
+    since = store.get("binance", symbol, interval)
+    start = since if since is not None else now_ms - lookback_ms
+
+    klines = [k for k in client.backfill_klines(symbol, interval, start, now_ms) if k[6] < now_ms]
+    if not klines:
+        return [], None
+    # Close time, not open + INTERVAL_MS: "1M" candles vary in length
+    return klines, klines[-1][6] + 1
+
+
+def extract_new_trades(
+    client: BinanceClient,
+    store: WatermarkStore,
+    symbol: str,
+    limit: int = 1000,
+    max_pages: int = 10
+) -> Tuple[List[Dict], Optional[int]]:
+    """
+    Fetch aggregate trades newer than the stored watermark.
+
+    Args:
+        client: Binance client
+        store: Watermark store
+        symbol: Trading pair
+        limit: Trades per request (max 1000)
+        max_pages: Cap on requests per run; the rest is picked up next run
+
+    Returns:
+        (new trades, new watermark); watermark is the last aggregate trade ID
+    """
+    last_id = store.get("binance", symbol)
+    if last_id is None:
+        # First run: start from the most recent page only
+        trades = client.fetch_agg_trades(symbol, limit=limit)
+        return trades, trades[-1]["a"] if trades else None
+
+    trades: List[Dict] = []
+    for _ in range(max_pages):
+        page = client.fetch_agg_trades(symbol, from_id=last_id + 1, limit=limit)
+        trades.extend(page)
+        if page:
+            last_id = page[-1]["a"]
+        if len(page) < limit:
+            break
+
+    return trades, last_id if trades else None
+
+
+# Example usage
+if __name__ == "__main__":
+    client = BinanceClient()
+    store = WatermarkStore(base_path="data")
+
+    klines, mark = extract_new_klines(client, store, "BTCUSDT", "1h")
+    print(f"Fetched {len(klines)} new 1h klines")
+    if mark is not None:
+        store.update("binance", "BTCUSDT", "1h", mark)
+
+    trades, last_id = extract_new_trades(client, store, "BTCUSDT")
+    print(f"Fetched {len(trades)} new trades")
+    if last_id is not None:
+        store.update("binance", "BTCUSDT", None, last_id)
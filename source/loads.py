@@ -4,13 +4,20 @@ Supports JSON, Parquet, and CSV formats with partitioning.
 """
 
 import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
 import json
+import uuid
 from datetime import datetime
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Sequence
 import os
 from pathlib import Path
 
 
+# Hive layout of partitioned datasets: .../year=2024/month=01/day=15/coin=bitcoin/
+DATASET_PARTITIONS = ("year", "month", "day", "coin")
+
+
 class LocalLoader:
     """Loader for writing data to local file system"""
     
@@ -70,12 +77,17 @@ class LocalLoader:
         
         Args:
             df: DataFrame to write
-            path: File path relative to base_path (e.g., 'processed/prices/2024-01-01/data.parquet')
-            partition_cols: Columns to partition by
+            path: File path relative to base_path (e.g., 'processed/prices/2024-01-01/data.parquet'),
+                or the dataset directory when partition_cols is given
+            partition_cols: Columns to partition by; the frame is written as a
+                Hive-partitioned dataset with write_dataset (appending)
         
         Returns:
             True if successful, False otherwise
         """
+        if partition_cols:
+            return self.write_dataset(df, path, partition_cols=partition_cols)
+        
         try:
             full_path = self.base_path / path
             full_path.parent.mkdir(parents=True, exist_ok=True)
@@ -88,6 +100,95 @@ class LocalLoader:
             print(f"✗ Error writing Parquet: {e}")
             return False
     
+    def write_dataset(
+        self,
+        df: pd.DataFrame,
+        path: str,
+        timestamp_col: str = "timestamp",
+        coin_col: str = "coin_id",
+        partition_cols: Sequence[str] = DATASET_PARTITIONS,
+        mode: str = "append",
+        row_group_size: int = 128 * 1024
+    ) -> bool:
+        """
+        Write a multi-coin frame as a Hive-partitioned Parquet dataset in one call.
+        
+        year/month/day are derived from the (UTC) timestamp and coin from
+        coin_col when requested and not already columns. Partition columns
+        live in the directory names only, so reading the dataset with
+        partitioning='hive' gives them back as columns.
+        
+        Rows are sorted by partition and timestamp before writing, so each
+        row group covers a narrow, non-overlapping timestamp range and its
+        min/max statistics let readers skip row groups as well as
+        directories.
+        
+        Args:
+            df: DataFrame to write
+            path: Dataset directory relative to base_path (e.g., 'processed/prices')
+            timestamp_col: Name of timestamp column
+            coin_col: Name of coin identifier column (written as the 'coin' partition)
+            partition_cols: Partition columns, outermost first
+            mode: 'append' adds new uniquely named files next to existing ones;
+                'overwrite' replaces the files of every partition written to
+            row_group_size: Maximum rows per row group
+        
+        Returns:
+            True if successful, False otherwise
+
+        Raises:
+            ValueError: If mode is not 'append' or 'overwrite'
+        """
+        if mode not in ("append", "overwrite"):
+            raise ValueError(f"mode must be 'append' or 'overwrite', got {mode!r}")
+        partition_cols = list(partition_cols)
+        try:
+            full_path = self.base_path / path
+            derived = {}
+            ts = None
+            for part, width in (("year", 4), ("month", 2), ("day", 2)):
+                if part not in partition_cols:
+                    continue
+                if part in df.columns:
+                    values = df[part]
+                else:
+                    if ts is None:
+                        ts = pd.to_datetime(df[timestamp_col], utc=True)
+                    values = getattr(ts.dt, part)
+                # Zero-padded like generate_partition_path (month=01)
+                derived[part] = values.astype(int).map(f"{{:0{width}d}}".format)
+            if "coin" in partition_cols and "coin" not in df.columns:
+                derived["coin"] = df[coin_col].astype(str)
+            
+            data = df.assign(**derived)
+            if "coin" in derived and coin_col in data.columns:
+                data = data.drop(columns=[coin_col])
+            sort_cols = list(partition_cols) + ([timestamp_col] if timestamp_col in data.columns else [])
+            data = data.sort_values(sort_cols, kind="stable")
+            table = pa.Table.from_pandas(data, preserve_index=False)
+            
+            n_partitions = len(data.drop_duplicates(subset=partition_cols)) if len(data) else 0
+            fmt = ds.ParquetFileFormat()
+            ds.write_dataset(
+                table,
+                str(full_path),
+                format=fmt,
+                file_options=fmt.make_write_options(compression="snappy", write_statistics=True),
+                partitioning=ds.partitioning(table.select(partition_cols).schema, flavor="hive"),
+                basename_template=f"part-{uuid.uuid4().hex}-{{i}}.parquet",
+                existing_data_behavior="overwrite_or_ignore" if mode == "append" else "delete_matching",
+                max_partitions=max(n_partitions, 1),
+                min_rows_per_group=min(row_group_size, 1024),
+                max_rows_per_group=row_group_size,
+                preserve_order=True,
+            )
+            print(f"✓ Wrote {len(data)} rows to {n_partitions} partitions under {full_path}")
+            return True
+            
+        except Exception as e:
+            print(f"✗ Error writing Parquet dataset: {e}")
+            return False
+    
     def write_csv(
         self,
         df: pd.DataFrame,
@@ -163,7 +264,7 @@ if __name__ == "__main__":
     
     # Write Parquet
     df = pd.DataFrame({
-        "timestamp": pd.date_range("2024-01-01", periods=10, freq="H"),
+        "timestamp": pd.date_range("2024-01-01", periods=10, freq="h"),
         "price": [50000 + i * 100 for i in range(10)],
         "volume": [1e9 + i * 1e8 for i in range(10)]
     })
@@ -171,6 +272,18 @@ if __name__ == "__main__":
     parquet_path = loader.generate_partition_path("processed/prices", coin_id="bitcoin")
     loader.write_parquet(df, f"{parquet_path}/data.parquet")
     
+    # Write a multi-coin frame as one partitioned dataset, then append to it
+    panel = pd.DataFrame({
+        "coin_id": ["bitcoin", "ethereum"] * 48,
+        "timestamp": pd.date_range("2024-01-01", periods=48, freq="h").repeat(2),
+        "price": [50000.0, 2500.0] * 48,
+    })
+    loader.write_dataset(panel.iloc[:48], "processed/prices_dataset")
+    loader.write_dataset(panel.iloc[48:], "processed/prices_dataset")
+    dataset = ds.dataset(str(loader.base_path / "processed/prices_dataset"), format="parquet", partitioning="hive")
+    print(f"  Dataset: {len(dataset.files)} files, "
+          f"{dataset.count_rows(filter=(ds.field('coin') == 'bitcoin') & (ds.field('day') == 2))} bitcoin rows on day 2")
+    
     print("\n✓ Local loader test complete!")
     print(f"  Data written to {loader.base_path}/")
     print(f"  Raw JSON: {raw_path}/data.json")
@@ -0,0 +1,356 @@
+"""
+Online (incremental) feature engine for streaming candles.
+Keeps O(window) state per coin and updates rolling, volatility, momentum,
+drawdown and volume features in O(1) per new bar instead of recomputing
+over the whole history.
+"""
+
+import math
+from collections import deque
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+
+class _RollingMoments:
+    """Rolling count/sum/sum-of-squares over the last `window` values (NaN-aware)"""
+
+    # Re-sum from the buffer this often to stop floating-point drift
+    RESUM_EVERY = 1000
+
+    def __init__(self, window: int, min_periods: Optional[int] = None):
+        self.window = window
+        self.min_periods = window if min_periods is None else min_periods
+        self.values: deque = deque()
+        self.count = 0
+        self.total = 0.0
+        self.total_sq = 0.0
+        self._updates = 0
+
+    def push(self, x: float) -> None:
+        self.values.append(x)
+        if not math.isnan(x):
+            self.count += 1
+            self.total += x
+            self.total_sq += x * x
+        if len(self.values) > self.window:
+            old = self.values.popleft()
+            if not math.isnan(old):
+                self.count -= 1
+                self.total -= old
+                self.total_sq -= old * old
+
+        self._updates += 1
+        if self._updates % self.RESUM_EVERY == 0:
+            valid = [v for v in self.values if not math.isnan(v)]
+            self.total = math.fsum(valid)
+            self.total_sq = math.fsum(v * v for v in valid)
+
+    def mean(self) -> float:
+        if self.count < max(self.min_periods, 1):
+            return math.nan
+        return self.total / self.count
+
+    def std(self) -> float:
+        if self.count < max(self.min_periods, 2):
+            return math.nan
+        var = (self.total_sq - self.total * self.total / self.count) / (self.count - 1)
+        return math.sqrt(max(var, 0.0))
+
+
+class _RollingExtreme:
+    """Rolling min or max over the last `window` values via a monotonic deque"""
+
+    def __init__(self, window: int, mode: str = "min"):
+        self.window = window
+        self.sign = 1.0 if mode == "min" else -1.0
+        self.queue: deque = deque()   # (position, signed value), increasing
+        self.position = -1
+
+    def push(self, x: float) -> float:
+        self.position += 1
+        if not math.isnan(x):
+            key = self.sign * x
+            while self.queue and self.queue[-1][1] >= key:
+                self.queue.pop()
+            self.queue.append((self.position, key))
+        while self.queue and self.queue[0][0] <= self.position - self.window:
+            self.queue.popleft()
+        return self.sign * self.queue[0][1] if self.queue else math.nan
+
+
+class _RollingCorr:
+    """Rolling Pearson correlation of two series (min_periods = window)"""
+
+    def __init__(self, window: int):
+        self.window = window
+        self.pairs: deque = deque()
+        self.n = 0
+        self.sx = self.sy = self.sxx = self.syy = self.sxy = 0.0
+
+    def _add(self, x: float, y: float, sign: float) -> None:
+        self.n += int(sign)
+        self.sx += sign * x
+        self.sy += sign * y
+        self.sxx += sign * x * x
+        self.syy += sign * y * y
+        self.sxy += sign * x * y
+
+    def push(self, x: float, y: float) -> float:
+        valid = not (math.isnan(x) or math.isnan(y))
+        self.pairs.append((x, y, valid))
+        if valid:
+            self._add(x, y, 1.0)
+        if len(self.pairs) > self.window:
+            ox, oy, ovalid = self.pairs.popleft()
+            if ovalid:
+                self._add(ox, oy, -1.0)
+
+        if self.n < self.window:
+            return math.nan
+        cov = self.sxy - self.sx * self.sy / self.n
+        var_x = self.sxx - self.sx * self.sx / self.n
+        var_y = self.syy - self.sy * self.sy / self.n
+        if var_x <= 0 or var_y <= 0:
+            return math.nan
+        return cov / math.sqrt(var_x * var_y)
+
+
+class _Ewm:
+    """ewm(span, adjust=False).mean() accumulator"""
+
+    def __init__(self, span: int):
+        self.alpha = 2.0 / (span + 1)
+        self.value = math.nan
+
+    def push(self, x: float) -> float:
+        if math.isnan(self.value):
+            self.value = x
+        elif not math.isnan(x):
+            self.value += self.alpha * (x - self.value)
+        return self.value
+
+
+class OnlineFeatureState:
+    """
+    Incremental feature state for a single coin.
+
+    Produces the same values as compute_rolling_features,
+    compute_volatility_metrics (except volatility_score),
+    compute_momentum_indicators, compute_drawdown and
+    compute_volume_features for the latest bar. volatility_score and
+    liquidity_score depend on full-series quantiles and are not updated
+    online.
+    """
+
+    def __init__(self, windows: List[int] = [7, 14, 30]):
+        """
+        Initialize online state.
+
+        Args:
+            windows: Rolling window sizes (in periods)
+        """
+        self.windows = list(windows)
+        self.prices: deque = deque(maxlen=max(self.windows) + 1)
+        self.price_moments = {w: _RollingMoments(w, min_periods=1) for w in self.windows}
+        self.price_min = {w: _RollingExtreme(w, "min") for w in self.windows}
+        self.price_max = {w: _RollingExtreme(w, "max") for w in self.windows}
+        self.log_return_moments = {w: _RollingMoments(w) for w in self.windows}
+        self.hl_moments = {w: _RollingMoments(w) for w in self.windows}
+        self.gain = _RollingMoments(14)
+        self.loss = _RollingMoments(14)
+        self.ema12 = _Ewm(12)
+        self.ema26 = _Ewm(26)
+        self.signal = _Ewm(9)
+        self.running_max = -math.inf
+        self.drawdown_min = _RollingExtreme(30, "min")
+        self.volume_7 = _RollingMoments(7, min_periods=1)
+        self.volume_30 = _RollingMoments(30, min_periods=1)
+        self.price_volume = _RollingCorr(30)
+        self.obv = math.nan
+        self.bars = 0
+
+    def update(
+        self,
+        price: float,
+        volume: Optional[float] = None,
+        high: Optional[float] = None,
+        low: Optional[float] = None
+    ) -> Dict[str, float]:
+        """
+        Add one bar and return the features for it.
+
+        Args:
+            price: Bar price (close)
+            volume: Bar volume, if tracked
+            high: Bar high, for Parkinson volatility
+            low: Bar low, for Parkinson volatility
+
+        Returns:
+            Dictionary of feature name -> value for the new bar
+        """
+        prev = self.prices[-1] if self.prices else math.nan
+        self.prices.append(price)
+        self.bars += 1
+        out: Dict[str, float] = {}
+
+        # Rolling features
+        for w in self.windows:
+            moments = self.price_moments[w]
+            moments.push(price)
+            ma = moments.mean()
+            out[f"ma_{w}"] = ma
+            out[f"std_{w}"] = moments.std()
+            out[f"return_{w}"] = price / self.prices[-w - 1] - 1 if self.bars > w else math.nan
+            out[f"min_{w}"] = self.price_min[w].push(price)
+            out[f"max_{w}"] = self.price_max[w].push(price)
+            out[f"ma_distance_{w}"] = (price - ma) / ma
+
+        # Volatility metrics
+        log_return = math.log(price / prev) if not math.isnan(prev) else math.nan
+        out["log_return"] = log_return
+        hl = math.log(high / low) ** 2 if high is not None and low is not None else None
+        for w in self.windows:
+            self.log_return_moments[w].push(log_return)
+            out[f"realized_vol_{w}"] = self.log_return_moments[w].std() * math.sqrt(365)
+            if hl is not None:
+                self.hl_moments[w].push(hl)
+                out[f"parkinson_vol_{w}"] = math.sqrt(
+                    self.hl_moments[w].mean() / (4 * math.log(2))
+                ) * math.sqrt(365)
+
+        # Momentum indicators
+        delta = price - prev
+        self.gain.push(delta if delta > 0 else 0.0)
+        self.loss.push(-delta if delta < 0 else 0.0)
+        gain, loss = self.gain.mean(), self.loss.mean()
+        if math.isnan(gain) or math.isnan(loss):
+            out["rsi"] = math.nan
+        elif loss == 0:
+            out["rsi"] = 100.0 if gain > 0 else math.nan
+        else:
+            out["rsi"] = 100 - (100 / (1 + gain / loss))
+        macd = self.ema12.push(price) - self.ema26.push(price)
+        macd_signal = self.signal.push(macd)
+        out["macd"] = macd
+        out["macd_signal"] = macd_signal
+        out["macd_histogram"] = macd - macd_signal
+
+        # Drawdown
+        self.running_max = max(self.running_max, price)
+        drawdown = (price - self.running_max) / self.running_max * 100
+        out["running_max"] = self.running_max
+        out["drawdown"] = drawdown
+        out["max_drawdown_30d"] = self.drawdown_min.push(drawdown)
+
+        # Volume features
+        if volume is not None:
+            self.volume_7.push(volume)
+            self.volume_30.push(volume)
+            volume_ma_30 = self.volume_30.mean()
+            out["volume_ma_7"] = self.volume_7.mean()
+            out["volume_ma_30"] = volume_ma_30
+            out["volume_ratio"] = volume / volume_ma_30
+            out["price_volume_corr"] = self.price_volume.push(price, volume)
+            if not math.isnan(delta):
+                step = float(np.sign(delta)) * volume
+                self.obv = step if math.isnan(self.obv) else self.obv + step
+            out["obv"] = self.obv
+
+        return out
+
+
+class OnlineFeatureEngine:
+    """Incremental feature state for many coins"""
+
+    def __init__(self, windows: List[int] = [7, 14, 30]):
+        self.windows = list(windows)
+        self.states: Dict[str, OnlineFeatureState] = {}
+
+    def update(
+        self,
+        coin_id: str,
+        price: float,
+        volume: Optional[float] = None,
+        high: Optional[float] = None,
+        low: Optional[float] = None
+    ) -> Dict[str, float]:
+        """Add one bar for a coin and return its features"""
+        state = self.states.get(coin_id)
+        if state is None:
+            state = self.states[coin_id] = OnlineFeatureState(self.windows)
+        return state.update(price, volume=volume, high=high, low=low)
+
+
+def replay(
+    df: pd.DataFrame,
+    windows: List[int] = [7, 14, 30],
+    price_col: str = "price",
+    volume_col: str = "volume"
+) -> pd.DataFrame:
+    """
+    Feed a single coin's history through OnlineFeatureState bar by bar.
+
+    Useful for warming up state from stored history and for checking parity
+    against the batch functions.
+
+    Args:
+        df: DataFrame with price (and optional volume, high, low) data
+        windows: Rolling window sizes
+        price_col: Name of price column
+        volume_col: Name of volume column
+
+    Returns:
+        DataFrame of online features, aligned with df's index
+    """
+    state = OnlineFeatureState(windows)
+    prices = df[price_col].to_numpy(dtype=np.float64)
+    volumes = df[volume_col].to_numpy(dtype=np.float64) if volume_col in df.columns else None
+    has_hl = "high" in df.columns and "low" in df.columns
+    highs = df["high"].to_numpy(dtype=np.float64) if has_hl else None
+    lows = df["low"].to_numpy(dtype=np.float64) if has_hl else None
+
+    rows = [
+        state.update(
+            prices[i],
+            volume=volumes[i] if volumes is not None else None,
+            high=highs[i] if has_hl else None,
+            low=lows[i] if has_hl else None
+        )
+        for i in range(len(prices))
+    ]
+    return pd.DataFrame(rows, index=df.index)
+
+
+# Example usage
+if __name__ == "__main__":
+    from source.features import (
+        compute_drawdown,
+        compute_momentum_indicators,
+        compute_rolling_features,
+        compute_volatility_metrics,
+        compute_volume_features,
+    )
+
+    np.random.seed(42)
+    n = 2000
+    prices = 50000 + np.cumsum(np.random.randn(n) * 500)
+    df = pd.DataFrame({
+        "timestamp": pd.date_range(start="2024-01-01", periods=n, freq="h"),
+        "price": prices,
+        "volume": np.random.randint(1e9, 5e9, size=n).astype(float),
+    })
+
+    batch = compute_volume_features(compute_drawdown(compute_momentum_indicators(
+        compute_volatility_metrics(compute_rolling_features(df)))))
+    online = replay(df)
+
+    worst = 0.0
+    for col in online.columns:
+        a, b = online[col].to_numpy(), batch[col].to_numpy()
+        both = ~np.isnan(a) & ~np.isnan(b)
+        assert (np.isnan(a) == np.isnan(b)).all(), col
+        rel = np.abs(a[both] - b[both]) / np.maximum(np.abs(b[both]), 1e-12)
+        worst = max(worst, rel.max() if rel.size else 0.0)
+    print(f"Online vs batch over {n} bars, {len(online.columns)} features: max relative error {worst:.2e}")
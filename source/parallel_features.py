@@ -0,0 +1,250 @@
+"""
+Process-pool feature engineering and risk scoring.
+Shards coins across worker processes and hands each shard over as an
+Arrow IPC buffer in shared memory instead of a pickled DataFrame, so
+the feature chain and compute_risk_score run on every core.
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from models.risk_models import compute_risk_score
+from source.features import compute_panel_features
+
+
+# Feature columns compute_risk_score reads when present
+RISK_INPUTS = ["volatility_score", "liquidity_score", "sentiment_score", "rsi"]
+
+
+def _table_to_shm(table: pa.Table) -> Tuple[str, int]:
+    """Write a table as an Arrow IPC stream into a new shared memory block"""
+    sink = pa.MockOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    size = sink.size()
+
+    shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+    target = pa.FixedSizeBufferWriter(pa.py_buffer(shm.buf))
+    with pa.ipc.new_stream(target, table.schema) as writer:
+        writer.write_table(table)
+    target.close()
+    del target, writer  # release the exported view before closing
+    shm.close()
+    return shm.name, size
+
+
+def _table_from_shm(name: str, size: int, unlink: bool = False) -> pa.Table:
+    """
+    Read an Arrow IPC stream from shared memory.
+
+    The stream is copied out in one memcpy so the block can be closed (and
+    unlinked) before returning.
+    """
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        data = pa.py_buffer(bytes(shm.buf[:size]))
+    finally:
+        shm.close()
+        if unlink:
+            shm.unlink()
+    return pa.ipc.open_stream(data).read_all()
+
+
+def _score_shard(
+    name: str,
+    size: int,
+    offset: int,
+    length: int,
+    coin_col: str,
+    timestamp_col: str,
+    windows: List[int],
+    weights: Optional[Dict[str, float]],
+    float_dtype: str
+) -> Tuple[Tuple[str, int], Tuple[str, int]]:
+    """Worker: features + risk scores for one contiguous coin range of the shared table"""
+    shm = shared_memory.SharedMemory(name=name)
+    table = pa.ipc.open_stream(pa.py_buffer(shm.buf)[:size]).read_all()
+    df = table.slice(offset, length).to_pandas()
+    features = compute_panel_features(
+        df, coin_col=coin_col, timestamp_col=timestamp_col,
+        windows=windows, float_dtype=float_dtype
+    )
+    scores = _latest_scores(features, coin_col, weights)
+    result = (
+        _table_to_shm(pa.Table.from_pandas(features, preserve_index=False)),
+        _table_to_shm(pa.Table.from_pandas(scores, preserve_index=False)),
+    )
+    # Columns may still be zero-copy views of the block; drop them before closing
+    del table, df, features, scores
+    shm.close()
+    return result
+
+
+def _latest_scores(features: pd.DataFrame, coin_col: str, weights: Optional[Dict[str, float]]) -> pd.DataFrame:
+    """Risk score of each coin's latest bar with every risk input defined"""
+    inputs = [c for c in RISK_INPUTS if c in features.columns]
+    latest = features.dropna(subset=inputs).groupby(coin_col, sort=False).tail(1)
+    return compute_risk_score(latest, weights=weights)
+
+
+def _shard_bounds(counts: np.ndarray, n_shards: int) -> List[Tuple[int, int]]:
+    """
+    Split contiguous per-coin row counts into (offset, length) ranges of
+    roughly equal row totals without splitting a coin.
+    """
+    ends = np.cumsum(counts)
+    total = int(ends[-1]) if len(ends) else 0
+    targets = total * np.arange(1, n_shards) / n_shards
+    cuts = np.unique(np.r_[0, ends[np.searchsorted(ends, targets)], total]) if total else np.array([0])
+    return [(int(a), int(b - a)) for a, b in zip(cuts[:-1], cuts[1:]) if b > a]
+
+
+def parallel_feature_scores(
+    df: pd.DataFrame,
+    coin_col: str = "coin_id",
+    timestamp_col: str = "timestamp",
+    windows: List[int] = [7, 14, 30],
+    weights: Optional[Dict[str, float]] = None,
+    max_workers: Optional[int] = None,
+    shards_per_worker: int = 2,
+    float_dtype: str = "float64"
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Compute panel features and risk scores with one process per CPU core.
+
+    The input is sorted by (coin, timestamp), written once as an Arrow IPC
+    stream into shared memory, and each worker slices its coin range out
+    of that block zero-copy. Results come back the same way and are
+    concatenated in coin order, so the output equals running
+    compute_panel_features and then compute_risk_score on each coin's
+    latest bar in one process.
+
+    Args:
+        df: Long DataFrame with coin, timestamp, price (and optional volume,
+            high, low) columns
+        coin_col: Name of coin identifier column
+        timestamp_col: Name of timestamp column
+        windows: Rolling window sizes (in periods)
+        weights: Risk component weights passed to compute_risk_score
+        max_workers: Worker processes (default: os.cpu_count())
+        shards_per_worker: Shards per worker, for load balancing
+        float_dtype: Storage dtype of the feature columns
+
+    Returns:
+        (features, scores): features sorted by (coin, timestamp), and one
+        row per coin (its latest bar with all risk inputs defined) with a
+        risk_score column
+    """
+    max_workers = max_workers or os.cpu_count() or 1
+    df = df.sort_values([coin_col, timestamp_col], kind="stable").reset_index(drop=True)
+    counts = df.groupby(coin_col, sort=False).size().to_numpy()
+    bounds = _shard_bounds(counts, max_workers * shards_per_worker)
+
+    name, size = _table_to_shm(pa.Table.from_pandas(df, preserve_index=False))
+    futures = []
+    try:
+        # Leaving the pool waits for every shard, so all result blocks exist below
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            futures = [
+                pool.submit(
+                    _score_shard, name, size, offset, length,
+                    coin_col, timestamp_col, windows, weights, float_dtype
+                )
+                for offset, length in bounds
+            ]
+        results = [future.result() for future in futures]
+
+        if not results:
+            features = compute_panel_features(
+                df, coin_col=coin_col, timestamp_col=timestamp_col, windows=windows, float_dtype=float_dtype
+            )
+            return features, _latest_scores(features, coin_col, weights)
+        features = pa.concat_tables([_table_from_shm(*f, unlink=True) for f, _ in results]).to_pandas()
+        scores = pa.concat_tables([_table_from_shm(*s, unlink=True) for _, s in results]).to_pandas()
+        return features, scores
+    finally:
+        # Input block, plus result blocks of shards that succeeded but were
+        # not read back because another shard or a read failed
+        _unlink_shm(name)
+        for future in futures:
+            if future.done() and not future.cancelled() and future.exception() is None:
+                for block_name, _ in future.result():
+                    _unlink_shm(block_name)
+
+
+def _unlink_shm(name: str) -> None:
+    """Remove a shared memory block if it still exists"""
+    try:
+        shm = shared_memory.SharedMemory(name=name)
+    except FileNotFoundError:
+        return
+    shm.close()
+    shm.unlink()
+
+
+def benchmark_scaling(
+    n_coins: int = 400,
+    n_rows: int = 2000,
+    worker_counts: Optional[List[int]] = None
+) -> pd.DataFrame:
+    """
+    Time parallel_feature_scores on a synthetic panel for several worker counts.
+
+    Returns:
+        DataFrame with workers, seconds, speedup and efficiency per run
+    """
+    rng = np.random.default_rng(42)
+    panel = pd.DataFrame({
+        "coin_id": np.repeat([f"coin-{i:05d}" for i in range(n_coins)], n_rows),
+        "timestamp": np.tile(pd.date_range("2024-01-01", periods=n_rows, freq="h"), n_coins),
+        "price": 1000 + np.cumsum(rng.normal(0, 1, (n_coins, n_rows)), axis=1).ravel(),
+        "volume": rng.uniform(1e6, 5e6, n_coins * n_rows),
+    })
+
+    if worker_counts is None:
+        cpus = os.cpu_count() or 1
+        worker_counts = sorted({1, 2, 4, 8, 16, 32, 64, cpus} & set(range(1, cpus + 1)))
+
+    rows = []
+    for workers in worker_counts:
+        start = time.perf_counter()
+        parallel_feature_scores(panel, max_workers=workers)
+        rows.append({"workers": workers, "seconds": time.perf_counter() - start})
+
+    result = pd.DataFrame(rows)
+    result["speedup"] = result["seconds"].iloc[0] / result["seconds"]
+    result["efficiency"] = result["speedup"] / result["workers"]
+    return result
+
+
+# Example usage
+if __name__ == "__main__":
+    rng = np.random.default_rng(0)
+    panel = pd.DataFrame({
+        "coin_id": np.repeat([f"coin-{i}" for i in range(50)], 500),
+        "timestamp": np.tile(pd.date_range("2024-01-01", periods=500, freq="h"), 50),
+        "price": 1000 + np.cumsum(rng.normal(0, 1, 25000)),
+        "volume": rng.uniform(1e6, 5e6, 25000),
+    })
+
+    start = time.perf_counter()
+    serial_features = compute_panel_features(panel).reset_index(drop=True)
+    serial_scores = _latest_scores(serial_features, "coin_id", None).reset_index(drop=True)
+    print(f"Serial: {time.perf_counter() - start:.2f}s")
+
+    start = time.perf_counter()
+    features, scores = parallel_feature_scores(panel)
+    print(f"Parallel ({os.cpu_count()} workers): {time.perf_counter() - start:.2f}s")
+    pd.testing.assert_frame_equal(features, serial_features)
+    pd.testing.assert_frame_equal(scores, serial_scores)
+    print("Parallel output matches serial run")
+    print(scores[["coin_id", "risk_score"]].head())
+
+    print(benchmark_scaling())
@@ -0,0 +1,244 @@
+"""
+Proactive rate limiting shared by the extract clients.
+Token buckets per API host, weighted request costs, server header feedback
+(Retry-After, Binance X-MBX-USED-WEIGHT) and jittered exponential backoff.
+"""
+
+import random
+import threading
+import time
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+import requests
+
+
+# Requests (or request weight) per minute, per host
+DEFAULT_HOST_LIMITS = {
+    "api.coingecko.com": 30,        # Public/demo tier
+    "pro-api.coingecko.com": 500,
+    "api.binance.us": 1200,         # Request weight per minute
+    "api.binance.com": 6000,
+}
+
+# Status codes that mean "slow down" rather than "bad request"
+RETRY_STATUS_CODES = (418, 429, 503)
+
+
+class TokenBucket:
+    """Thread-safe token bucket refilled continuously at a fixed rate"""
+
+    def __init__(self, rate_per_minute: float, capacity: Optional[float] = None):
+        """
+        Initialize token bucket.
+
+        Args:
+            rate_per_minute: Tokens (request weight) added per minute
+            capacity: Maximum burst size (default: one minute of tokens)
+        """
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity if capacity is not None else float(rate_per_minute)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self, cost: float = 1) -> float:
+        """
+        Take tokens for one request without blocking.
+
+        The bucket may go into debt; callers must wait the returned delay
+        before sending, which keeps concurrent callers in FIFO order.
+
+        Args:
+            cost: Request weight
+
+        Returns:
+            Seconds to wait before sending the request
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.tokens -= cost
+            delay = -self.tokens / self.rate if self.tokens < 0 else 0.0
+            return max(delay, self.blocked_until - now, 0.0)
+
+    def acquire(self, cost: float = 1) -> None:
+        """Block until the request may be sent"""
+        delay = self.reserve(cost)
+        if delay > 0:
+            time.sleep(delay)
+
+    def block_for(self, seconds: float) -> None:
+        """Stop handing out tokens for the given number of seconds"""
+        with self._lock:
+            now = time.monotonic()
+            self.blocked_until = max(self.blocked_until, now + seconds)
+            self.tokens = min(self.tokens, 0.0)
+            self.updated = now
+
+    def sync_used(self, used: float) -> None:
+        """
+        Align the bucket with usage reported by the server.
+
+        Only ever lowers the available tokens: other processes sharing the
+        same IP quota are invisible to us except through this header.
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            self.tokens = min(self.tokens, self.capacity - used)
+
+
+class RateLimiter:
+    """Per-host token buckets shared by every client in the process"""
+
+    def __init__(
+        self,
+        host_limits: Optional[Dict[str, float]] = None,
+        default_rate_per_minute: float = 60
+    ):
+        """
+        Initialize rate limiter.
+
+        Args:
+            host_limits: Requests/weight per minute keyed by host name
+            default_rate_per_minute: Limit for hosts not in host_limits
+        """
+        self.host_limits = dict(DEFAULT_HOST_LIMITS)
+        if host_limits:
+            self.host_limits.update(host_limits)
+        self.default_rate_per_minute = default_rate_per_minute
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, url: str) -> TokenBucket:
+        """Get (or create) the bucket for the host of a URL"""
+        host = urlparse(url).netloc or url
+        with self._lock:
+            if host not in self._buckets:
+                rate = self.host_limits.get(host, self.default_rate_per_minute)
+                self._buckets[host] = TokenBucket(rate)
+            return self._buckets[host]
+
+    def reserve(self, url: str, cost: float = 1) -> float:
+        """Reserve tokens for a request; returns seconds to wait"""
+        return self.bucket(url).reserve(cost)
+
+    def acquire(self, url: str, cost: float = 1) -> None:
+        """Block until a request to url of the given weight may be sent"""
+        self.bucket(url).acquire(cost)
+
+    def observe(self, url: str, status_code: int, headers) -> None:
+        """
+        Feed response headers back into the host bucket.
+
+        Args:
+            url: Request URL
+            status_code: HTTP status code
+            headers: Response headers (case-insensitive mapping)
+        """
+        bucket = self.bucket(url)
+
+        used = headers.get("X-MBX-USED-WEIGHT-1M") or headers.get("X-MBX-USED-WEIGHT")
+        if used is not None:
+            try:
+                bucket.sync_used(float(used))
+            except ValueError:
+                pass
+
+        if status_code in RETRY_STATUS_CODES:
+            retry_after = parse_retry_after(headers.get("Retry-After"))
+            if retry_after is not None:
+                bucket.block_for(retry_after)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header given in seconds (HTTP-date is ignored)"""
+    if value is None:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        return None
+
+
+def backoff_delay(attempt: int, base: float = 1.0, cap: float = 60.0) -> float:
+    """
+    Exponential backoff with full jitter.
+
+    Args:
+        attempt: Zero-based retry attempt
+        base: Delay scale in seconds
+        cap: Maximum delay in seconds
+
+    Returns:
+        Random delay in [0, min(cap, base * 2**attempt)]
+    """
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+def limited_get(
+    session: requests.Session,
+    url: str,
+    params: Optional[Dict] = None,
+    limiter: Optional[RateLimiter] = None,
+    weight: float = 1,
+    max_retries: int = 3,
+    timeout: float = 10,
+    headers: Optional[Dict[str, str]] = None
+) -> requests.Response:
+    """
+    GET through the rate limiter, retrying throttled responses.
+
+    Args:
+        session: Pooled requests session
+        url: Endpoint URL
+        params: Query parameters
+        limiter: Rate limiter (default: the shared process-wide limiter)
+        weight: Request weight charged against the host quota
+        max_retries: Retries for 418/429/503 responses
+        timeout: Request timeout in seconds
+        headers: Extra request headers (e.g. conditional revalidation)
+
+    Returns:
+        Successful (2xx/304) response
+
+    Raises:
+        requests.exceptions.RequestException: On HTTP errors after retries
+    """
+    limiter = limiter or shared_rate_limiter
+
+    for attempt in range(max_retries + 1):
+        limiter.acquire(url, weight)
+        response = session.get(url, params=params, timeout=timeout, headers=headers)
+        limiter.observe(url, response.status_code, response.headers)
+
+        if response.status_code in RETRY_STATUS_CODES and attempt < max_retries:
+            # Retry-After already blocks the bucket; jitter spreads the herd
+            if parse_retry_after(response.headers.get("Retry-After")) is None:
+                time.sleep(backoff_delay(attempt))
+            print(f"Throttled ({response.status_code}) on {url}, retry {attempt + 1}/{max_retries}")
+            continue
+
+        response.raise_for_status()
+        return response
+
+
+# Shared by all extract clients unless one is passed explicitly
+shared_rate_limiter = RateLimiter()
+
+
+# Example usage
+if __name__ == "__main__":
+    limiter = RateLimiter(host_limits={"example.com": 120})
+
+    start = time.monotonic()
+    for _ in range(125):
+        limiter.acquire("https://example.com/api", cost=1)
+    print(f"125 requests at 120/min (burst 120) took {time.monotonic() - start:.2f}s")
+
+    print("Backoff delays:", [round(backoff_delay(a), 2) for a in range(5)])
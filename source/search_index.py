@@ -0,0 +1,261 @@
+"""
+Coin search index over id, symbol and name.
+Prefix lookups come from a flattened trie (every term prefix -> coins
+ranked by market cap); typos are tolerated by looking up every variant of
+the query one edit away in the same prefix table.
+"""
+
+import bisect
+import threading
+from typing import Dict, Iterable, List, Set
+
+
+def _tokenize(doc: Dict) -> Set[str]:
+    """Searchable terms of one coin: id, symbol, full name and each word"""
+    terms = set()
+    for field in ("id", "symbol", "name"):
+        value = str(doc.get(field) or "").lower().strip()
+        if not value:
+            continue
+        terms.add(value)
+        for word in value.replace("-", " ").replace("_", " ").split():
+            terms.add(word)
+    return terms
+
+
+ALPHABET = "abcdefghijklmnopqrstuvwxyz0123456789"
+
+
+def _edits1(query: str) -> Set[str]:
+    """Strings one deletion, transposition, substitution or insertion away"""
+    splits = [(query[:i], query[i:]) for i in range(len(query) + 1)]
+    deletes = [a + b[1:] for a, b in splits if b]
+    transposes = [a + b[1] + b[0] + b[2:] for a, b in splits if len(b) > 1]
+    replaces = [a + c + b[1:] for a, b in splits if b for c in ALPHABET]
+    inserts = [a + c + b for a, b in splits for c in ALPHABET]
+    return set(deletes + transposes + replaces + inserts) - {query, ""}
+
+
+class CoinSearchIndex:
+    """
+    In-memory search index for the coin universe.
+
+    update() is incremental: only new, renamed or delisted coins are
+    (re)tokenized, and only the prefix lists holding a changed coin (new
+    terms or a new market cap) are re-ranked. Updates replace postings
+    instead of mutating them and searches tolerate coins evicted while
+    they run, so searches never take a lock and never wait for an update.
+    """
+
+    def __init__(self, max_prefix: int = 16):
+        """
+        Initialize search index.
+
+        Args:
+            max_prefix: Longest prefix stored per term; longer queries are
+                matched by filtering that prefix's coins
+        """
+        self.max_prefix = max_prefix
+        self.docs: Dict[str, Dict] = {}
+        self._doc_terms: Dict[str, Set[str]] = {}
+        self._term_docs: Dict[str, frozenset] = {}
+        self._prefix_counts: Dict[str, Dict[str, int]] = {}
+        self._prefixes: Dict[str, List[str]] = {}
+        self._write_lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.docs)
+
+    def _rank(self, coin_ids: Iterable[str]) -> List[str]:
+        # Searches run without the write lock, so ids evicted meanwhile are skipped
+        docs = self.docs
+        ranked = []
+        for c in set(coin_ids):
+            doc = docs.get(c)
+            if doc is not None:
+                ranked.append((-(doc["market_cap"] or 0.0), c))
+        ranked.sort()
+        return [c for _, c in ranked]
+
+    def _prefixes_of(self, terms: Iterable[str]) -> Set[str]:
+        return {term[:n] for term in terms for n in range(1, min(len(term), self.max_prefix) + 1)}
+
+    def _rerank(self, prefix: str, changed: Set[str]) -> None:
+        """Re-rank one prefix list after the given coins were added, removed or re-capped"""
+        counts = self._prefix_counts.get(prefix)
+        if not counts:
+            self._prefix_counts.pop(prefix, None)
+            self._prefixes.pop(prefix, None)
+            return
+        ranked = self._prefixes.get(prefix)
+        if ranked is None or 8 * len(changed) > len(ranked):
+            self._prefixes[prefix] = self._rank(counts)
+            return
+        # Unchanged coins keep their relative order; insert the changed ones
+        docs = self.docs
+        kept = [c for c in ranked if c not in changed]
+        key = lambda c: (-(docs[c]["market_cap"] or 0.0), c)
+        for coin_id in changed:
+            if coin_id in counts:
+                bisect.insort(kept, coin_id, key=key)
+        self._prefixes[prefix] = kept
+
+    def _add_terms(self, coin_id: str, terms: Set[str], touched: Dict[str, Set[str]]) -> None:
+        for term in terms:
+            self._term_docs[term] = self._term_docs.get(term, frozenset()) | {coin_id}
+            for n in range(1, min(len(term), self.max_prefix) + 1):
+                counts = self._prefix_counts.setdefault(term[:n], {})
+                counts[coin_id] = counts.get(coin_id, 0) + 1
+                touched.setdefault(term[:n], set()).add(coin_id)
+        self._doc_terms[coin_id] = terms
+
+    def _remove_terms(self, coin_id: str, touched: Dict[str, Set[str]]) -> None:
+        for term in self._doc_terms.pop(coin_id, set()):
+            holders = self._term_docs.get(term, frozenset()) - {coin_id}
+            if holders:
+                self._term_docs[term] = holders
+            else:
+                self._term_docs.pop(term, None)
+            for n in range(1, min(len(term), self.max_prefix) + 1):
+                counts = self._prefix_counts[term[:n]]
+                counts[coin_id] -= 1
+                if counts[coin_id] <= 0:
+                    del counts[coin_id]
+                touched.setdefault(term[:n], set()).add(coin_id)
+
+    def update(self, coins: Iterable[Dict], complete: bool = True) -> int:
+        """
+        Sync the index with a coin universe.
+
+        Args:
+            coins: Records with id, symbol, name and market_cap (e.g. the
+                CoinGecko /coins/markets response)
+            complete: coins is the full universe; indexed coins missing from
+                it are evicted. Pass False to add or refresh a few coins.
+
+        Returns:
+            Number of coins added, renamed or evicted
+        """
+        with self._write_lock:
+            touched: Dict[str, Set[str]] = {}
+            changed = 0
+            seen: Set[str] = set()
+            for coin in coins:
+                coin_id = coin.get("id") or coin.get("coin_id")
+                if not coin_id:
+                    continue
+                seen.add(coin_id)
+                doc = {
+                    "id": coin_id,
+                    "symbol": coin.get("symbol"),
+                    "name": coin.get("name"),
+                    "market_cap": coin.get("market_cap"),
+                }
+                old = self.docs.get(coin_id)
+                self.docs[coin_id] = doc
+                if old is not None and (old["symbol"], old["name"]) == (doc["symbol"], doc["name"]):
+                    terms = self._doc_terms[coin_id]
+                else:
+                    terms = _tokenize(doc)
+                if old is None or terms != self._doc_terms.get(coin_id):
+                    self._remove_terms(coin_id, touched)
+                    self._add_terms(coin_id, terms, touched)
+                    changed += 1
+                elif old["market_cap"] != doc["market_cap"]:
+                    # Same postings, new position in every list that holds the coin
+                    for prefix in self._prefixes_of(terms):
+                        touched.setdefault(prefix, set()).add(coin_id)
+
+            if complete:
+                for coin_id in [c for c in self.docs if c not in seen]:
+                    self._remove_terms(coin_id, touched)
+                    del self.docs[coin_id]
+                    changed += 1
+
+            for prefix, coin_ids in touched.items():
+                self._rerank(prefix, coin_ids)
+            return changed
+
+    def _prefix_ids(self, query: str) -> List[str]:
+        if len(query) <= self.max_prefix:
+            return self._prefixes.get(query, [])
+        return [
+            c for c in self._prefixes.get(query[:self.max_prefix], [])
+            if any(t.startswith(query) for t in self._doc_terms.get(c, ()))
+        ]
+
+    def _fuzzy_ids(self, query: str, exclude: Set[str], limit: int) -> List[str]:
+        # A typo anywhere in a partially typed word is still one edit from
+        # some stored prefix, so variants are looked up like prefixes.
+        # Postings are ranked, so each variant contributes at most its top `limit`.
+        matches: Set[str] = set()
+        for variant in _edits1(query):
+            matches.update(c for c in self._prefix_ids(variant)[:limit + len(exclude)] if c not in exclude)
+        return self._rank(matches)[:limit]
+
+    def search(self, query: str, limit: int = 10, fuzzy: bool = True) -> List[Dict]:
+        """
+        Find coins by id, symbol or name.
+
+        Exact id/symbol/name matches come first, then prefix matches by market
+        cap, then (if fuzzy and there is room) coins matching the query
+        with one typo, by market cap.
+
+        Args:
+            query: Search text
+            limit: Maximum results
+            fuzzy: Include typo-tolerant matches
+
+        Returns:
+            Matching coin records, best first
+        """
+        query = query.lower().strip()
+        if not query:
+            return []
+        docs = self.docs
+        exact = self._rank(
+            c for c in self._term_docs.get(query, ())
+            if query in (
+                c.lower(),
+                str((docs.get(c) or {}).get("symbol") or "").lower().strip(),
+                str((docs.get(c) or {}).get("name") or "").lower().strip(),
+            )
+        )
+        seen = set(exact)
+        ids = exact + [c for c in self._prefix_ids(query)[:limit + len(exact)] if c not in seen]
+        if fuzzy and len(ids) < limit and len(query) >= 3:
+            ids += self._fuzzy_ids(query, set(ids), limit - len(ids))
+        return [doc for doc in map(docs.get, ids) if doc is not None][:limit]
+
+
+# Example usage
+if __name__ == "__main__":
+    import random
+    import string
+    import time
+
+    rng = random.Random(42)
+    coins = [
+        {"id": "bitcoin", "symbol": "btc", "name": "Bitcoin", "market_cap": 1.3e12},
+        {"id": "ethereum", "symbol": "eth", "name": "Ethereum", "market_cap": 4.1e11},
+        {"id": "wrapped-bitcoin", "symbol": "wbtc", "name": "Wrapped Bitcoin", "market_cap": 9e9},
+        {"id": "bitcoin-cash", "symbol": "bch", "name": "Bitcoin Cash", "market_cap": 8e9},
+    ]
+    for i in range(10_000):
+        word = "".join(rng.choices(string.ascii_lowercase, k=rng.randint(4, 10)))
+        coins.append({"id": f"{word}-{i}", "symbol": word[:4], "name": word.title(), "market_cap": rng.lognormvariate(17, 2)})
+
+    index = CoinSearchIndex()
+    start = time.perf_counter()
+    index.update(coins)
+    print(f"Indexed {len(index)} coins in {(time.perf_counter() - start) * 1000:.0f}ms")
+
+    for query in ["bit", "btc", "eth", "bitcion", "etherium", "wrapped", "bitcoin cash"]:
+        start = time.perf_counter()
+        results = index.search(query, limit=5)
+        elapsed_us = (time.perf_counter() - start) * 1e6
+        print(f"{query!r:12} {elapsed_us:7.0f}us  {[r['id'] for r in results]}")
+
+    start = time.perf_counter()
+    index.update([{"id": "bitcoin-2", "symbol": "btc2", "name": "Bitcoin Two", "market_cap": 1e10}], complete=False)
+    print(f"Incremental add: {(time.perf_counter() - start) * 1000:.1f}ms -> {[r['id'] for r in index.search('bit', 3)]}")
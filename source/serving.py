@@ -0,0 +1,693 @@
+"""
+Local HTTP API serving the latest scored snapshot to the dashboard.
+Holds the snapshot in memory with pre-rendered JSON bodies and ETags,
+and hot-swaps it atomically when a new pipeline run publishes one.
+"""
+
+import hashlib
+import json
+import math
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+import pandas as pd
+
+from source.chart_series import CHART_AGG, DEFAULT_POINTS, ROLLUPS, build_rollups, downsample_range, pick_rollup
+from source.search_index import CoinSearchIndex
+
+
+SCORES_PATH = "processed/scores/latest.parquet"
+HISTORY_PATH = "processed/history/latest.parquet"
+CHARTS_DIR = "processed/charts"
+
+# Frontend TimeRange -> milliseconds
+RANGES_MS = {
+    "1D": 86_400_000,
+    "7D": 7 * 86_400_000,
+    "30D": 30 * 86_400_000,
+    "90D": 90 * 86_400_000,
+    "1Y": 365 * 86_400_000,
+}
+
+SORT_KEYS = ["market_cap", "risk_score", "volatility_score", "liquidity_score", "total_volume"]
+MAX_PAGE_SIZE = 1000
+MAX_CHART_POINTS = 2000
+# Rendered /api/coins pages kept per snapshot (LRU); page keys come from clients
+MAX_CACHED_PAGES = 128
+
+# Coin fields served in list responses (src/types/crypto.ts Coin)
+COIN_FIELDS = [
+    "id", "symbol", "name", "current_price", "price_change_24h",
+    "price_change_percentage_24h", "market_cap", "total_volume", "rank",
+    "risk_score", "volatility_score", "liquidity_score", "sentiment_score", "image",
+]
+
+HISTORY_FIELDS = ["price", "volume", "volatility", "ma_7", "ma_30"]
+
+Body = Tuple[bytes, str]
+
+
+class BadRequest(ValueError):
+    """Invalid client-supplied request parameter (served as HTTP 400)"""
+
+
+def _render(payload) -> Body:
+    """Serialize a payload once and derive its strong ETag"""
+    body = json.dumps(payload, separators=(",", ":"), allow_nan=False).encode()
+    return body, '"' + hashlib.sha1(body).hexdigest()[:20] + '"'
+
+
+def _records(df: pd.DataFrame) -> List[Dict]:
+    """DataFrame rows as JSON-safe dicts (NaN/±inf -> null, numpy -> Python scalars)"""
+    clean = df.astype(object).where(df.notna() & ~df.isin([np.inf, -np.inf]), None)
+    return [
+        {k: (v.item() if isinstance(v, np.generic) else v) for k, v in row.items()}
+        for row in clean.to_dict("records")
+    ]
+
+
+def _points(ms: np.ndarray, columns: Dict[str, np.ndarray]) -> List[Dict]:
+    """PricePoint rows from aligned ms timestamps and value arrays (NaN/±inf -> null)"""
+    values = {"timestamp": ms.tolist()}
+    for name, column in columns.items():
+        values[name] = [v if math.isfinite(v) else None for v in column.tolist()]
+    return [dict(zip(values, row)) for row in zip(*values.values())]
+
+
+class ScoreSnapshot:
+    """
+    Immutable, pre-rendered view of one scored pipeline run.
+
+    Rows are converted to JSON-safe dicts when the snapshot is built and
+    each body is rendered on its first request and memoized, so a repeat
+    request is a dict lookup plus a socket write. A snapshot is never
+    mutated after it is published to a SnapshotStore.
+    """
+
+    def __init__(
+        self,
+        coins: pd.DataFrame,
+        history: Optional[pd.DataFrame] = None,
+        version: Optional[str] = None,
+        charts: Optional[Dict[str, pd.DataFrame]] = None
+    ):
+        """
+        Build a snapshot.
+
+        Args:
+            coins: One row per coin with an 'id' column (or 'coin_id') and
+                the Coin/CoinDetail fields that are available
+            history: Long frame with coin_id, timestamp and price (optional
+                volume, volatility, ma_7, ma_30) columns
+            version: Snapshot identifier (default: build time)
+            charts: Rollup name -> long frame from chart_series.build_rollups
+        """
+        if "id" not in coins.columns and "coin_id" in coins.columns:
+            coins = coins.rename(columns={"coin_id": "id"})
+        self.version = version or time.strftime("%Y%m%dT%H%M%S")
+        self.built_at = time.time()
+
+        coins = coins.reset_index(drop=True)
+        if "market_cap" in coins.columns:
+            coins = coins.sort_values("market_cap", ascending=False, kind="stable", na_position="last")
+        if "rank" not in coins.columns:
+            coins["rank"] = np.arange(1, len(coins) + 1)
+        self.coins = coins.reset_index(drop=True)
+
+        detail = _records(self.coins)
+        self.ids = [row["id"] for row in detail]
+        self._rows: Dict[str, Dict] = {row["id"]: row for row in detail}
+        self._positions: Dict[str, int] = {coin_id: i for i, coin_id in enumerate(self.ids)}
+        self._detail: Dict[str, Body] = {}
+        list_fields = [c for c in COIN_FIELDS if c in self.coins.columns]
+        self._list_rows = [{k: row[k] for k in list_fields} for row in detail]
+        self._orders: Dict[Tuple[str, bool], np.ndarray] = {}
+        self._lists: "OrderedDict[Tuple, Body]" = OrderedDict()
+        self._lists_lock = threading.Lock()
+
+        self._history = self._index_series(history, HISTORY_FIELDS) if history is not None else {}
+        self._history_bodies: Dict[Tuple[str, Optional[str]], Body] = {}
+        # Finest rollup first, as pick_rollup expects
+        self._charts = {
+            name: self._index_series(charts[name], list(CHART_AGG))
+            for name in ROLLUPS if name in (charts or {})
+        }
+        self._chart_bodies: Dict[Tuple, Body] = {}
+
+    @staticmethod
+    def _index_series(frame: pd.DataFrame, fields: List[str]) -> Dict[str, Tuple[np.ndarray, Dict[str, np.ndarray]]]:
+        """Split a long (coin_id, timestamp, ...) frame into per-coin ms/value arrays"""
+        if not len(frame):
+            return {}
+        frame = frame.sort_values(["coin_id", "timestamp"], kind="stable")
+        timestamps = frame["timestamp"]
+        if pd.api.types.is_datetime64_any_dtype(timestamps):
+            ms = pd.to_datetime(timestamps, utc=True).dt.as_unit("ms").astype(np.int64).to_numpy()
+        else:
+            ms = timestamps.to_numpy(dtype=np.int64)
+        columns = {f: frame[f].to_numpy(dtype=np.float64) for f in fields if f in frame.columns}
+        codes = pd.factorize(frame["coin_id"])[0]
+        bounds = np.r_[0, np.flatnonzero(np.diff(codes)) + 1, len(codes)]
+        series = {}
+        for a, b in zip(bounds[:-1], bounds[1:]):
+            series[frame["coin_id"].iat[a]] = (ms[a:b], {f: v[a:b] for f, v in columns.items()})
+        return series
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def warm(self) -> "ScoreSnapshot":
+        """
+        Pre-render the bodies every dashboard load asks for (the first
+        /api/coins page for each sort key), so the first requests after a
+        swap are dict lookups too. Call before publishing to a store.
+        """
+        for sort in SORT_KEYS:
+            self.top(sort=sort)
+        return self
+
+    def search_records(self) -> List[Dict]:
+        """id/symbol/name/market_cap of every coin, for CoinSearchIndex"""
+        return [
+            {"id": row["id"], "symbol": row.get("symbol"), "name": row.get("name"), "market_cap": row.get("market_cap")}
+            for row in self._rows.values()
+        ]
+
+    def search_results(self, coin_ids: List[str]) -> Body:
+        """Rendered list rows for the search hits present in this snapshot"""
+        return _render([self._list_rows[self._positions[c]] for c in coin_ids if c in self._positions])
+
+    def top(self, limit: int = 100, sort: str = "market_cap", descending: bool = True, offset: int = 0) -> Optional[Body]:
+        """
+        Rendered page of coins ordered by a score or market field.
+
+        Raises:
+            BadRequest: If limit is outside 1..MAX_PAGE_SIZE or offset is negative
+        """
+        if not 1 <= limit <= MAX_PAGE_SIZE:
+            raise BadRequest(f"limit must be between 1 and {MAX_PAGE_SIZE}")
+        if offset < 0:
+            raise BadRequest("offset must not be negative")
+        if sort not in SORT_KEYS or sort not in self.coins.columns:
+            return None
+        key = (sort, descending, offset, limit)
+        with self._lists_lock:
+            body = self._lists.get(key)
+            if body is not None:
+                self._lists.move_to_end(key)
+                return body
+
+        order = self._orders.get((sort, descending))
+        if order is None:
+            values = self.coins[sort].to_numpy(dtype=np.float64)
+            values = np.where(np.isnan(values), -np.inf if descending else np.inf, values)
+            order = np.argsort(-values if descending else values, kind="stable")
+            self._orders[(sort, descending)] = order
+        rows = [self._list_rows[i] for i in order[offset:offset + limit]]
+        body = _render({"version": self.version, "total": len(self), "coins": rows})
+        with self._lists_lock:
+            self._lists[key] = body
+            while len(self._lists) > MAX_CACHED_PAGES:
+                self._lists.popitem(last=False)
+        return body
+
+    def detail(self, coin_id: str) -> Optional[Body]:
+        """Rendered CoinDetail for one coin"""
+        body = self._detail.get(coin_id)
+        if body is None and coin_id in self._rows:
+            body = self._detail[coin_id] = _render(self._rows[coin_id])
+        return body
+
+    def history(self, coin_id: str, time_range: Optional[str] = None) -> Optional[Body]:
+        """Rendered PricePoint series for one coin, optionally limited to a TimeRange"""
+        if coin_id not in self._history or (time_range is not None and time_range not in RANGES_MS):
+            return None
+        key = (coin_id, time_range)
+        body = self._history_bodies.get(key)
+        if body is None:
+            ms, columns = self._history[coin_id]
+            start = 0
+            if time_range is not None and len(ms):
+                start = int(np.searchsorted(ms, ms[-1] - RANGES_MS[time_range], side="left"))
+            body = self._history_bodies[key] = _render(_points(ms[start:], {k: v[start:] for k, v in columns.items()}))
+        return body
+
+    def chart(
+        self,
+        coin_id: str,
+        time_range: Optional[str] = None,
+        start_ms: Optional[int] = None,
+        end_ms: Optional[int] = None,
+        points: int = DEFAULT_POINTS
+    ) -> Optional[Body]:
+        """
+        Rendered chart series for any range, at most `points` points.
+
+        The finest rollup that covers the range in a few times the point
+        budget is sliced and LTTB-downsampled. The range ends at end_ms or,
+        by default, at the coin's last observed bar (the last bar of the
+        finest rollup; coarser bars may be labeled after it). Standard
+        TimeRange requests at the default budget are memoized.
+
+        Raises:
+            BadRequest: If points is outside 3..MAX_CHART_POINTS
+        """
+        if not 3 <= points <= MAX_CHART_POINTS:
+            raise BadRequest(f"points must be between 3 and {MAX_CHART_POINTS}")
+        if not self._charts or (time_range is not None and time_range not in RANGES_MS):
+            return None
+        key = (coin_id, time_range, start_ms, end_ms, points)
+        body = self._chart_bodies.get(key)
+        if body is not None:
+            return body
+
+        finest = self._charts[next(iter(self._charts))].get(coin_id)
+        if finest is None or not len(finest[0]):
+            return None
+        end = end_ms if end_ms is not None else int(finest[0][-1])
+        if time_range is not None:
+            start = end - RANGES_MS[time_range]
+        else:
+            start = start_ms if start_ms is not None else int(finest[0][0])
+        rollup = pick_rollup(end - start, points, available=tuple(self._charts))
+        series = self._charts[rollup].get(coin_id)
+        if series is None:
+            return None
+
+        # Without an explicit end keep the newest coarse bar, which may be
+        # labeled after the last observation (e.g. W-SUN bars)
+        sampled = downsample_range(series[0], series[1], start, end_ms, points)
+        body = _render({
+            "rollup": rollup,
+            "points": _points(sampled.pop("timestamp"), sampled),
+        })
+        if time_range is not None and start_ms is None and end_ms is None and points == DEFAULT_POINTS:
+            self._chart_bodies[key] = body
+        return body
+
+
+class SnapshotStore:
+    """
+    Holder of the snapshot currently being served.
+
+    Readers take one reference per request, so swapping in a new snapshot
+    is atomic: in-flight requests finish against the old one and the next
+    request sees the new one. New snapshots are built off the request path.
+    """
+
+    def __init__(self, snapshot: Optional[ScoreSnapshot] = None):
+        self._snapshot = ScoreSnapshot(pd.DataFrame({"id": []}))
+        self._lock = threading.Lock()
+        # Outlives snapshots so each swap only indexes new or renamed coins
+        self.search_index = CoinSearchIndex()
+        self._watcher: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+        self._loaded_mtime = 0.0
+        if snapshot is not None:
+            self.swap(snapshot)
+
+    @property
+    def current(self) -> ScoreSnapshot:
+        return self._snapshot
+
+    def swap(self, snapshot: ScoreSnapshot) -> ScoreSnapshot:
+        """Publish a new snapshot and return the previous one"""
+        # Index and snapshot change together so concurrent swaps (a watcher
+        # reload racing a manual load) cannot leave them from different runs
+        with self._lock:
+            self.search_index.update(snapshot.search_records())
+            previous, self._snapshot = self._snapshot, snapshot
+        return previous
+
+    def load(
+        self,
+        base_path: str = "data",
+        scores_path: str = SCORES_PATH,
+        history_path: str = HISTORY_PATH,
+        charts_dir: str = CHARTS_DIR
+    ) -> bool:
+        """
+        Build a snapshot from the published Parquet files and swap it in.
+
+        Returns:
+            True if a snapshot was loaded
+        """
+        scores_file = Path(base_path) / scores_path
+        history_file = Path(base_path) / history_path
+        try:
+            stat = scores_file.stat()
+            coins = pd.read_parquet(scores_file)
+            history = pd.read_parquet(history_file) if history_file.exists() else None
+            charts = {
+                name: pd.read_parquet(path)
+                for name in ROLLUPS
+                for path in [Path(base_path) / charts_dir / f"{name}.parquet"] if path.exists()
+            }
+        except Exception as e:
+            print(f"✗ Error loading snapshot: {e}")
+            return False
+
+        self.swap(ScoreSnapshot(coins, history, version=str(stat.st_mtime_ns), charts=charts).warm())
+        self._loaded_mtime = stat.st_mtime
+        print(f"✓ Serving snapshot {self.current.version} ({len(self.current)} coins)")
+        return True
+
+    def watch(self, base_path: str = "data", interval: float = 5.0, **paths) -> threading.Thread:
+        """Reload in the background whenever the scores file changes"""
+        scores_file = Path(base_path) / paths.get("scores_path", SCORES_PATH)
+
+        def poll():
+            while not self._stopped.wait(interval):
+                try:
+                    if scores_file.stat().st_mtime > self._loaded_mtime:
+                        self.load(base_path, **paths)
+                except FileNotFoundError:
+                    continue
+
+        self._watcher = threading.Thread(target=poll, daemon=True)
+        self._watcher.start()
+        return self._watcher
+
+    def stop(self) -> None:
+        self._stopped.set()
+
+
+def publish_snapshot(
+    coins: pd.DataFrame,
+    history: Optional[pd.DataFrame] = None,
+    base_path: str = "data",
+    scores_path: str = SCORES_PATH,
+    history_path: str = HISTORY_PATH,
+    charts: Optional[Dict[str, pd.DataFrame]] = None,
+    charts_dir: str = CHARTS_DIR
+) -> None:
+    """
+    Write a scored snapshot for the API to pick up.
+
+    Chart rollups and history are written first and each file is renamed
+    into place, so a watcher that sees the new scores file never reads a
+    partial write. History or rollup files left by an earlier publish that
+    this one omits are removed before the scores file is replaced, so they
+    are never served alongside the new scores.
+    """
+    charts = charts or {}
+    stale = [history_path] if history is None else []
+    stale += [f"{charts_dir}/{name}.parquet" for name in ROLLUPS if name not in charts]
+    for path in stale:
+        (Path(base_path) / path).unlink(missing_ok=True)
+
+    chart_files = [(frame, f"{charts_dir}/{name}.parquet") for name, frame in charts.items()]
+    for df, path in chart_files + [(history, history_path), (coins, scores_path)]:
+        if df is None:
+            continue
+        target = Path(base_path) / path
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp = target.with_suffix(".tmp")
+        df.to_parquet(tmp, engine="pyarrow", compression="snappy", index=False)
+        os.replace(tmp, target)
+
+
+class RiskAPIHandler(BaseHTTPRequestHandler):
+    """Routes /api paths to the current snapshot's pre-rendered bodies"""
+
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out as separate writes; without TCP_NODELAY the
+    # body waits on the client's delayed ACK (~40ms) on keep-alive connections
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def _param(self, query: Dict, name: str, default=None):
+        values = query.get(name)
+        return values[0] if values else default
+
+    def _int_param(self, query: Dict, name: str, default: Optional[int] = None) -> Optional[int]:
+        value = self._param(query, name)
+        if value is None or value == "":
+            return default
+        try:
+            return int(value)
+        except ValueError:
+            raise BadRequest(f"{name} must be an integer")
+
+    def route(self, snapshot: ScoreSnapshot, parts: List[str], query: Dict) -> Optional[Body]:
+        if parts == ["api", "health"]:
+            return _render({"version": snapshot.version, "coins": len(snapshot), "built_at": snapshot.built_at})
+        if parts == ["api", "search"]:
+            hits = self.server.store.search_index.search(
+                self._param(query, "q", ""), limit=min(max(self._int_param(query, "limit", 10), 1), 50)
+            )
+            return snapshot.search_results([hit["id"] for hit in hits])
+        if parts == ["api", "coins"]:
+            return snapshot.top(
+                limit=self._int_param(query, "limit", 100),
+                sort=self._param(query, "sort", "market_cap"),
+                descending=self._param(query, "order", "desc") != "asc",
+                offset=self._int_param(query, "offset", 0),
+            )
+        if len(parts) == 3 and parts[:2] == ["api", "coins"]:
+            return snapshot.detail(parts[2])
+        if len(parts) == 4 and parts[:2] == ["api", "coins"] and parts[3] == "history":
+            return snapshot.history(parts[2], self._param(query, "range"))
+        if len(parts) == 4 and parts[:2] == ["api", "coins"] and parts[3] == "chart":
+            return snapshot.chart(
+                parts[2],
+                time_range=self._param(query, "range"),
+                start_ms=self._int_param(query, "start"),
+                end_ms=self._int_param(query, "end"),
+                points=self._int_param(query, "points", DEFAULT_POINTS),
+            )
+        return None
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        snapshot = self.server.store.current  # one reference for the whole request
+        status, error = 200, None
+        try:
+            result = self.route(snapshot, [p for p in url.path.split("/") if p], parse_qs(url.query))
+            if result is None:
+                status, error = 404, "not found"
+        except BadRequest as e:
+            status, error = 400, str(e)
+        except Exception as e:
+            print(f"✗ Error handling {self.path}: {e!r}")
+            status, error = 500, "internal error"
+
+        if error is not None:
+            self.send_response(status)
+            body, etag = json.dumps({"error": error}).encode(), None
+        else:
+            body, etag = result
+            if self.headers.get("If-None-Match") == etag:
+                self.send_response(304)
+                body = b""
+            else:
+                self.send_response(200)
+
+        if etag:
+            self.send_header("ETag", etag)
+            self.send_header("Cache-Control", "no-cache")
+        self.send_header("Access-Control-Allow-Origin", "*")
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def start_api_server(
+    store: SnapshotStore,
+    host: str = "127.0.0.1",
+    port: int = 8000,
+    switch_interval: Optional[float] = 0.0005
+) -> Tuple[ThreadingHTTPServer, str]:
+    """
+    Start the API on a background thread.
+
+    Args:
+        store: Snapshot holder to serve from
+        host: Interface to bind
+        port: Port to bind (0 = pick a free port)
+        switch_interval: GIL switch interval (s) for this process, or None
+            to leave it. While a snapshot is built or loaded on another
+            thread, each socket read/write of a request waits up to this
+            long for the GIL; the 5ms default stacks into the p99 tail.
+
+    Returns:
+        (server, root URL); call server.shutdown() to stop it
+    """
+    if switch_interval is not None:
+        sys.setswitchinterval(switch_interval)
+    server = ThreadingHTTPServer((host, port), RiskAPIHandler)
+    server.daemon_threads = True
+    server.store = store
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server, f"http://{host}:{server.server_port}"
+
+
+def _synthetic_snapshot(n_coins: int, n_points: int, seed: int = 0) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    rng = np.random.default_rng(seed)
+    ids = [f"coin-{i}" for i in range(n_coins)]
+    coins = pd.DataFrame({
+        "id": ids,
+        "symbol": [f"C{i}" for i in range(n_coins)],
+        "name": [f"Coin {i}" for i in range(n_coins)],
+        "current_price": rng.lognormal(2, 2, n_coins),
+        "market_cap": rng.lognormal(18, 2, n_coins),
+        "total_volume": rng.lognormal(15, 2, n_coins),
+        "risk_score": rng.integers(0, 101, n_coins),
+        "volatility_score": rng.uniform(0, 100, n_coins),
+        "liquidity_score": rng.uniform(0, 100, n_coins),
+        "sentiment_score": rng.uniform(0, 100, n_coins),
+    })
+    history = pd.DataFrame({
+        "coin_id": np.repeat(ids[:100], n_points),
+        "timestamp": np.tile(pd.date_range("2024-01-01", periods=n_points, freq="h"), 100),
+        "price": rng.lognormal(2, 1, 100 * n_points),
+        "volume": rng.lognormal(15, 1, 100 * n_points),
+    })
+    return coins, history
+
+
+def _latency_worker(host: str, port: int, paths: List[str], n: int) -> List[float]:
+    """Load generator: latencies (ms) of n keep-alive requests cycling through paths"""
+    import http.client
+
+    conn = http.client.HTTPConnection(host, port)
+    latencies = []
+    for i in range(n):
+        start = time.perf_counter()
+        conn.request("GET", paths[i % len(paths)])
+        conn.getresponse().read()
+        latencies.append((time.perf_counter() - start) * 1000)
+    conn.close()
+    return latencies
+
+
+TARGET_P99_MS = 10.0
+
+
+def benchmark_latency(
+    n_coins: int = 10_000,
+    n_requests: int = 5000,
+    concurrency: int = 16,
+    swap_interval: float = 1.0
+) -> Dict[str, float]:
+    """
+    Measure read latency under concurrent dashboard-like load while
+    snapshots are built and swapped in the background.
+
+    Each of the concurrent clients runs in its own process, so the server process only pays
+    for serving and snapshot builds (as with a real dashboard) and the
+    load generator does not compete with it for the GIL. Snapshots are
+    built and warmed on a server-side thread, like SnapshotStore.watch.
+
+    Returns:
+        Dictionary with requests, swaps, p50_ms, p99_ms, max_ms and
+        meets_target (p99 below TARGET_P99_MS)
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    coins, history = _synthetic_snapshot(n_coins, 24 * 90)
+    store = SnapshotStore(ScoreSnapshot(coins, history).warm())
+    server, root = start_api_server(store, port=0)
+    host, port = server.server_address[:2]
+    paths = (
+        ["/api/coins?limit=100", "/api/coins?limit=100&sort=risk_score"]
+        + [f"/api/coins/coin-{i}" for i in range(0, n_coins, max(n_coins // 50, 1))]
+        + [f"/api/coins/coin-{i}/history?range=7D" for i in range(20)]
+    )
+
+    swaps = 0
+    done = threading.Event()
+
+    def swapper():
+        nonlocal swaps
+        seed = 1
+        while not done.wait(swap_interval):
+            store.swap(ScoreSnapshot(*_synthetic_snapshot(n_coins, 24 * 90, seed)).warm())
+            seed += 1
+            swaps += 1
+
+    thread = threading.Thread(target=swapper, daemon=True)
+    thread.start()
+    try:
+        with ProcessPoolExecutor(max_workers=concurrency) as pool:
+            futures = [
+                pool.submit(_latency_worker, host, port, paths, n_requests // concurrency)
+                for _ in range(concurrency)
+            ]
+            latencies = np.concatenate([np.array(f.result()) for f in futures])
+    finally:
+        done.set()
+        thread.join()
+        server.shutdown()
+
+    p99 = float(np.percentile(latencies, 99))
+    return {
+        "requests": len(latencies),
+        "swaps": swaps,
+        "p50_ms": float(np.percentile(latencies, 50)),
+        "p99_ms": p99,
+        "max_ms": float(latencies.max()),
+        "meets_target": p99 < TARGET_P99_MS,
+    }
+
+
+# Example usage
+if __name__ == "__main__":
+    import tempfile
+    import urllib.request
+
+    base = tempfile.mkdtemp()
+    coins, history = _synthetic_snapshot(1000, 24 * 30)
+    publish_snapshot(coins, history, base_path=base, charts=build_rollups(history))
+
+    store = SnapshotStore()
+    store.load(base)
+    store.watch(base, interval=0.5)
+    server, root = start_api_server(store, port=0)
+
+    with urllib.request.urlopen(f"{root}/api/coins?limit=3&sort=risk_score") as r:
+        etag = r.headers["ETag"]
+        print(r.status, json.loads(r.read())["coins"][0])
+    request = urllib.request.Request(f"{root}/api/coins?limit=3&sort=risk_score", headers={"If-None-Match": etag})
+    try:
+        urllib.request.urlopen(request)
+    except urllib.error.HTTPError as e:
+        print("Revalidation:", e.code)
+
+    with urllib.request.urlopen(f"{root}/api/coins/coin-0/chart?range=30D&points=100") as r:
+        chart = json.loads(r.read())
+        print(f"Chart: {chart['rollup']} rollup, {len(chart['points'])} points, {r.headers['Content-Length']} bytes")
+
+    # The default range end is the last observed bar, not a coarse bar's label
+    last_bar = int(pd.to_datetime(history.loc[history["coin_id"] == "coin-0", "timestamp"]).max().value // 1_000_000)
+    one_day = json.loads(store.current.chart("coin-0", "1D")[0])["points"]
+    assert one_day[-1]["timestamp"] == last_bar and len(one_day) == 25, one_day[-1]
+    print(f"✓ 1D chart ends at the last observed bar ({len(one_day)} points)")
+
+    with urllib.request.urlopen(f"{root}/api/search?q=coin%2012&limit=3") as r:
+        print("Search:", [c["id"] for c in json.loads(r.read())])
+
+    publish_snapshot(*_synthetic_snapshot(1200, 24 * 30, seed=1), base_path=base)
+    time.sleep(1.5)
+    with urllib.request.urlopen(f"{root}/api/health") as r:
+        print("After publish:", json.loads(r.read()))
+
+    store.stop()
+    server.shutdown()
+
+    result = benchmark_latency()
+    print(result)
+    if not result["meets_target"]:
+        print(f"✗ p99 {result['p99_ms']:.1f}ms misses the {TARGET_P99_MS:.0f}ms target on this machine")
@@ -0,0 +1,385 @@
+"""
+Live Binance WebSocket ingestion.
+Subscribes to depth-diff and trade streams, keeps a local order book per
+symbol synced from one REST snapshot plus diffs, and includes a replay
+server so the ingestion path can be exercised offline.
+"""
+
+import asyncio
+import bisect
+import json
+import random
+import threading
+from collections import deque
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+import websockets
+
+from source.extracts_binance import BinanceClient
+
+
+STREAM_URL = "wss://stream.binance.us:9443/stream"
+
+
+class LocalOrderBook:
+    """
+    Order book for one symbol maintained from a snapshot plus depth diffs.
+
+    Follows the Binance sync procedure: diffs received before the snapshot
+    are buffered, diffs older than the snapshot are dropped, and any gap in
+    update IDs marks the book out of sync until a new snapshot is applied.
+    Reads and writes are guarded by a lock so the book can be read from
+    other threads while the ingestor updates it. At most max_pending diffs
+    are buffered while a snapshot is outstanding; once older ones are
+    dropped the replay finds a gap and a fresh snapshot is requested.
+    """
+
+    def __init__(self, symbol: str, max_pending: int = 10_000):
+        self.symbol = symbol
+        self.max_pending = max_pending
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Discard all levels and wait for a new snapshot"""
+        self.bids: Dict[float, float] = {}
+        self.asks: Dict[float, float] = {}
+        self._bid_keys: List[float] = []   # Negated prices, ascending = best first
+        self._ask_keys: List[float] = []
+        self.last_update_id: Optional[int] = None
+        self.synced = False
+        self._first_diff = True
+        self._pending: Deque[Dict] = deque(maxlen=self.max_pending)
+
+    @staticmethod
+    def _set_level(levels: Dict[float, float], keys: List[float], price: float, key: float, qty: float) -> None:
+        if qty == 0:
+            if levels.pop(price, None) is not None:
+                del keys[bisect.bisect_left(keys, key)]
+        else:
+            if price not in levels:
+                bisect.insort(keys, key)
+            levels[price] = qty
+
+    def _update_levels(self, bids: List, asks: List) -> None:
+        for price, qty in bids:
+            price = float(price)
+            self._set_level(self.bids, self._bid_keys, price, -price, float(qty))
+        for price, qty in asks:
+            price = float(price)
+            self._set_level(self.asks, self._ask_keys, price, price, float(qty))
+
+    def _apply_diff(self, event: Dict) -> bool:
+        first_id, last_id = event["U"], event["u"]
+        if last_id <= self.last_update_id:
+            return True  # Already contained in the snapshot
+
+        expected = self.last_update_id + 1
+        if self._first_diff:
+            if not first_id <= expected <= last_id:
+                return False
+        elif first_id != expected:
+            return False
+
+        self._update_levels(event.get("b", []), event.get("a", []))
+        self.last_update_id = last_id
+        self._first_diff = False
+        return True
+
+    def apply_snapshot(self, snapshot: Dict) -> bool:
+        """
+        Load a REST depth snapshot and replay buffered diffs on top of it.
+
+        Args:
+            snapshot: Response of GET /depth
+
+        Returns:
+            True if the book is synced, False if a gap requires a new snapshot
+        """
+        with self.lock:
+            pending = self._pending
+            self.reset()
+            self._update_levels(snapshot.get("bids", []), snapshot.get("asks", []))
+            self.last_update_id = snapshot["lastUpdateId"]
+            self.synced = True
+
+            for event in pending:
+                if not self._apply_diff(event):
+                    self.reset()
+                    return False
+            return True
+
+    def apply_diff(self, event: Dict) -> bool:
+        """
+        Apply one depthUpdate event.
+
+        Args:
+            event: Depth diff with U/u update IDs and b/a level changes
+
+        Returns:
+            False if the book fell out of sync and needs a new snapshot
+        """
+        with self.lock:
+            if not self.synced:
+                self._pending.append(event)
+                return True
+            if not self._apply_diff(event):
+                self.reset()
+                return False
+            return True
+
+    def to_dict(self, limit: int = 100) -> Dict:
+        """
+        Top of book in the REST /depth response shape.
+
+        Args:
+            limit: Levels per side
+
+        Returns:
+            {"lastUpdateId", "bids": [[price, qty], ...], "asks": [...]}
+        """
+        with self.lock:
+            return {
+                "lastUpdateId": self.last_update_id,
+                "bids": [[-k, self.bids[-k]] for k in self._bid_keys[:limit]],
+                "asks": [[k, self.asks[k]] for k in self._ask_keys[:limit]],
+            }
+
+
+class BinanceStreamIngestor:
+    """Maintains local order books and recent trades from Binance streams"""
+
+    def __init__(
+        self,
+        symbols: List[str],
+        client: Optional[BinanceClient] = None,
+        stream_url: str = STREAM_URL,
+        depth_limit: int = 1000,
+        snapshot_fetcher: Optional[Callable[[str, int], Dict]] = None,
+        max_trades: int = 1000
+    ):
+        """
+        Initialize stream ingestor.
+
+        Args:
+            symbols: Trading pairs to follow
+            client: REST client used for depth snapshots
+            stream_url: Combined-stream WebSocket endpoint
+            depth_limit: Levels requested in each REST snapshot
+            snapshot_fetcher: Override for (symbol, limit) -> snapshot,
+                e.g. a replay snapshot when testing offline
+            max_trades: Recent trades kept per symbol
+        """
+        self.symbols = [s.upper() for s in symbols]
+        self.client = client or BinanceClient()
+        self.stream_url = stream_url
+        self.depth_limit = depth_limit
+        self.snapshot_fetcher = snapshot_fetcher or self.client.fetch_orderbook
+        self.books: Dict[str, LocalOrderBook] = {s: LocalOrderBook(s) for s in self.symbols}
+        self.trades: Dict[str, Deque[Dict]] = {s: deque(maxlen=max_trades) for s in self.symbols}
+        self._stopped = False
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._ws = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        streams = "/".join(
+            f"{s.lower()}@depth@100ms/{s.lower()}@trade" for s in self.symbols
+        )
+        return f"{self.stream_url}?streams={streams}"
+
+    async def _resync(self, symbol: str) -> None:
+        """Fetch a snapshot off the event loop and apply it"""
+        loop = asyncio.get_running_loop()
+        while not self._stopped:
+            snapshot = await loop.run_in_executor(None, self.snapshot_fetcher, symbol, self.depth_limit)
+            if snapshot.get("lastUpdateId") is not None and self.books[symbol].apply_snapshot(snapshot):
+                return
+            await asyncio.sleep(1)
+
+    def handle_message(self, message: Dict) -> Optional[str]:
+        """
+        Route one combined-stream message.
+
+        Returns:
+            Symbol that needs a new snapshot, if any
+        """
+        data = message.get("data", message)
+        symbol = data.get("s")
+        if symbol not in self.books:
+            return None
+
+        if data.get("e") == "depthUpdate":
+            if not self.books[symbol].apply_diff(data):
+                print(f"Order book for {symbol} out of sync, resyncing")
+                return symbol
+        elif data.get("e") == "trade":
+            self.trades[symbol].append(data)
+        return None
+
+    async def run(self) -> None:
+        """Consume streams until stop() is called, reconnecting on errors"""
+        self._loop = asyncio.get_running_loop()
+        while not self._stopped:
+            resyncs: List[asyncio.Task] = []
+            try:
+                async with websockets.connect(self.url, max_size=None) as ws:
+                    self._ws = ws
+                    for book in self.books.values():
+                        book.reset()
+                    resyncs = [asyncio.create_task(self._resync(s)) for s in self.symbols]
+
+                    async for raw in ws:
+                        try:
+                            symbol = self.handle_message(json.loads(raw))
+                        except (ValueError, KeyError, TypeError, AttributeError) as e:
+                            print(f"Skipping malformed stream message: {e!r}")
+                            continue
+                        if symbol is not None:
+                            resyncs.append(asyncio.create_task(self._resync(symbol)))
+            except (OSError, websockets.exceptions.WebSocketException) as e:
+                if not self._stopped:
+                    print(f"Stream error: {e}; reconnecting")
+                    await asyncio.sleep(1)
+            finally:
+                # A snapshot fetched for this connection must never land on
+                # the books the next connection has just reset
+                for task in resyncs:
+                    task.cancel()
+                self._ws = None
+
+    def start_in_thread(self) -> threading.Thread:
+        """Run the ingestor on a background thread with its own event loop"""
+        self._thread = threading.Thread(target=lambda: asyncio.run(self.run()), daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def stop(self) -> None:
+        """Stop consuming and close the connection"""
+        self._stopped = True
+        if self._loop is not None and self._ws is not None:
+            asyncio.run_coroutine_threadsafe(self._ws.close(), self._loop)
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+
+class ReplayStreamServer:
+    """Local WebSocket server that replays recorded combined-stream messages"""
+
+    def __init__(self, messages: List[Dict], host: str = "127.0.0.1", port: int = 0, delay: float = 0.0):
+        """
+        Initialize replay server.
+
+        Args:
+            messages: Combined-stream messages sent to every client in order
+            host: Interface to bind
+            port: Port to bind (0 = pick a free port)
+            delay: Seconds between messages
+        """
+        self.messages = messages
+        self.host = host
+        self.port = port
+        self.delay = delay
+        self._server = None
+
+    async def _handler(self, ws) -> None:
+        for message in self.messages:
+            await ws.send(json.dumps(message))
+            if self.delay:
+                await asyncio.sleep(self.delay)
+        await ws.wait_closed()
+
+    async def start(self) -> str:
+        """Start serving; returns the ws:// URL to pass as stream_url"""
+        self._server = await websockets.serve(self._handler, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return f"ws://{self.host}:{self.port}/stream"
+
+    async def stop(self) -> None:
+        self._server.close()
+        await self._server.wait_closed()
+
+
+def load_recording(path: str) -> List[Dict]:
+    """Load messages recorded one JSON object per line"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+async def record_stream(symbols: List[str], path: str, n_messages: int = 1000, stream_url: str = STREAM_URL) -> None:
+    """Record live combined-stream messages to a JSONL file for replay"""
+    url = BinanceStreamIngestor(symbols, stream_url=stream_url).url
+    async with websockets.connect(url, max_size=None) as ws:
+        with open(path, 'w', encoding='utf-8') as f:
+            for _ in range(n_messages):
+                f.write(await ws.recv() + "\n")
+
+
+def synthetic_session(symbol: str, n_events: int = 500, levels: int = 50, seed: int = 0) -> Tuple[Dict, List[Dict]]:
+    """
+    Generate a consistent depth snapshot plus diff/trade messages.
+
+    The first diffs overlap the snapshot's lastUpdateId, as on the live feed.
+
+    Returns:
+        (snapshot, messages) for use with ReplayStreamServer
+    """
+    rng = random.Random(seed)
+    mid = 100.0
+    snapshot_id = 1000
+    snapshot = {
+        "lastUpdateId": snapshot_id,
+        "bids": [[f"{mid - 0.01 * (i + 1):.2f}", f"{rng.uniform(1, 10):.4f}"] for i in range(levels)],
+        "asks": [[f"{mid + 0.01 * (i + 1):.2f}", f"{rng.uniform(1, 10):.4f}"] for i in range(levels)],
+    }
+
+    messages = []
+    update_id = snapshot_id - 5
+    stream = symbol.lower()
+    for i in range(n_events):
+        first = update_id + 1
+        update_id += rng.randint(1, 3)
+        side = [[f"{mid - 0.01 * rng.randint(1, levels):.2f}", f"{rng.choice([0, rng.uniform(1, 10)]):.4f}"]]
+        other = [[f"{mid + 0.01 * rng.randint(1, levels):.2f}", f"{rng.choice([0, rng.uniform(1, 10)]):.4f}"]]
+        messages.append({
+            "stream": f"{stream}@depth@100ms",
+            "data": {"e": "depthUpdate", "E": i, "s": symbol, "U": first, "u": update_id, "b": side, "a": other},
+        })
+        if i % 5 == 0:
+            messages.append({
+                "stream": f"{stream}@trade",
+                "data": {"e": "trade", "E": i, "s": symbol, "t": i, "p": f"{mid:.2f}", "q": "0.5", "T": i, "m": bool(i % 2)},
+            })
+    return snapshot, messages
+
+
+# Example usage
+if __name__ == "__main__":
+    import time
+
+    async def replay_demo():
+        snapshot, messages = synthetic_session("BTCUSDT")
+        server = ReplayStreamServer(messages)
+        url = await server.start()
+
+        ingestor = BinanceStreamIngestor(
+            ["BTCUSDT"], stream_url=url,
+            snapshot_fetcher=lambda symbol, limit: snapshot
+        )
+        task = asyncio.create_task(ingestor.run())
+        await asyncio.sleep(1)
+
+        client = BinanceClient(order_books=ingestor.books)
+        start = time.perf_counter()
+        score = client.compute_liquidity_score("BTCUSDT")
+        elapsed_us = (time.perf_counter() - start) * 1e6
+        print(f"Liquidity from local book: {score:.2f} in {elapsed_us:.0f}us "
+              f"(update id {ingestor.books['BTCUSDT'].last_update_id}, "
+              f"{len(ingestor.trades['BTCUSDT'])} trades)")
+
+        ingestor.stop()
+        await task
+        await server.stop()
+
+    asyncio.run(replay_demo())
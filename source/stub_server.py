@@ -0,0 +1,203 @@
+"""
+Local HTTP stub of the CoinGecko and Binance endpoints used by the extract
+clients. Serves deterministic synthetic payloads so client throughput can be
+benchmarked offline.
+"""
+
+import asyncio
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+
+def _orderbook(symbol: str, limit: int) -> Dict:
+    rng = random.Random(symbol)
+    mid = rng.uniform(1, 50000)
+    tick = mid * 1e-4
+    return {
+        "lastUpdateId": int(time.time() * 1000),
+        "bids": [[f"{mid - (i + 1) * tick:.8f}", f"{rng.uniform(0.1, 10):.8f}"] for i in range(limit)],
+        "asks": [[f"{mid + (i + 1) * tick:.8f}", f"{rng.uniform(0.1, 10):.8f}"] for i in range(limit)],
+    }
+
+
+def _klines(symbol: str, limit: int, start_time: Optional[int], interval_ms: int = 3_600_000) -> List[List]:
+    rng = random.Random(symbol)
+    start = start_time if start_time is not None else int(time.time() * 1000) - limit * interval_ms
+    start -= start % interval_ms
+    price = rng.uniform(1, 50000)
+    rows = []
+    for i in range(limit):
+        open_time = start + i * interval_ms
+        close = price * (1 + rng.gauss(0, 0.01))
+        rows.append([
+            open_time, f"{price:.8f}", f"{max(price, close) * 1.002:.8f}",
+            f"{min(price, close) * 0.998:.8f}", f"{close:.8f}", f"{rng.uniform(10, 1000):.8f}",
+            open_time + interval_ms - 1, "0", 100, "0", "0", "0"
+        ])
+        price = close
+    return rows
+
+
+def _trades(symbol: str, limit: int) -> List[Dict]:
+    rng = random.Random(symbol)
+    now = int(time.time() * 1000)
+    return [
+        {
+            "id": i, "price": f"{rng.uniform(1, 50000):.8f}", "qty": f"{rng.uniform(0.01, 5):.8f}",
+            "quoteQty": "0", "time": now - (limit - i) * 100, "isBuyerMaker": bool(i % 2),
+            "isBestMatch": True
+        }
+        for i in range(limit)
+    ]
+
+
+def _agg_trades(symbol: str, limit: int, from_id: Optional[int]) -> List[Dict]:
+    rng = random.Random(symbol)
+    now = int(time.time() * 1000)
+    first = from_id if from_id is not None else 1_000_000
+    return [
+        {
+            "a": first + i, "p": f"{rng.uniform(1, 50000):.8f}", "q": f"{rng.uniform(0.01, 5):.8f}",
+            "f": first + i, "l": first + i, "T": now - (limit - i) * 100, "m": bool(i % 2), "M": True
+        }
+        for i in range(limit)
+    ]
+
+
+def _markets(per_page: int, page: int) -> List[Dict]:
+    offset = (page - 1) * per_page
+    return [
+        {
+            "id": f"coin-{i}", "symbol": f"c{i}", "name": f"Coin {i}",
+            "current_price": 100.0 / i, "market_cap": 1e12 / i, "total_volume": 1e10 / i,
+            "market_cap_rank": i
+        }
+        for i in range(offset + 1, offset + per_page + 1)
+    ]
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Routes API paths to synthetic payloads"""
+
+    protocol_version = "HTTP/1.1"  # Keep-alive, like the real APIs
+
+    def log_message(self, format, *args):
+        pass
+
+    def _param(self, query: Dict, name: str, default=None):
+        values = query.get(name)
+        return values[0] if values else default
+
+    def route(self, path: str, query: Dict):
+        symbol = self._param(query, "symbol", "BTCUSDT")
+        if path.endswith("/depth"):
+            return _orderbook(symbol, int(self._param(query, "limit", 100)))
+        if path.endswith("/klines"):
+            start = self._param(query, "startTime")
+            return _klines(symbol, int(self._param(query, "limit", 500)), int(start) if start else None)
+        if path.endswith("/aggTrades"):
+            from_id = self._param(query, "fromId")
+            return _agg_trades(symbol, int(self._param(query, "limit", 500)), int(from_id) if from_id else None)
+        if path.endswith("/trades"):
+            return _trades(symbol, int(self._param(query, "limit", 500)))
+        if path.endswith("/exchangeInfo"):
+            return {"timezone": "UTC", "symbols": [{"symbol": symbol, "status": "TRADING"}]}
+        if path.endswith("/ticker/24hr"):
+            return {"symbol": symbol, "lastPrice": "100.0", "priceChangePercent": "1.0"}
+        if path.endswith("/coins/markets"):
+            return _markets(int(self._param(query, "per_page", 250)), int(self._param(query, "page", 1)))
+        if path.endswith("/search/trending"):
+            return {"coins": []}
+        if path.endswith("/ohlc"):
+            return [row[:5] for row in _klines(path, 30, None, 86_400_000)]
+        if "/coins/" in path:
+            coin_id = path.rsplit("/", 1)[-1]
+            return {"id": coin_id, "name": coin_id.title(), "market_cap_rank": 1}
+        return None
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        latency = self.server.latency
+        if latency:
+            time.sleep(latency)
+
+        payload = self.route(url.path, parse_qs(url.query))
+        if payload is None:
+            self.send_response(404)
+            body = b'{"error": "not found"}'
+        else:
+            self.send_response(200)
+            body = json.dumps(payload).encode()
+            self.send_header("X-MBX-USED-WEIGHT-1M", "1")
+
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def start_stub_server(host: str = "127.0.0.1", port: int = 0, latency: float = 0.0) -> Tuple[ThreadingHTTPServer, str]:
+    """
+    Start the stub server on a background thread.
+
+    Args:
+        host: Interface to bind
+        port: Port to bind (0 = pick a free port)
+        latency: Artificial per-request latency in seconds
+
+    Returns:
+        (server, root URL); call server.shutdown() to stop it
+    """
+    server = ThreadingHTTPServer((host, port), StubHandler)
+    server.daemon_threads = True
+    server.latency = latency
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server, f"http://{host}:{server.server_port}"
+
+
+def benchmark_orderbooks(n_requests: int = 2000, max_concurrency: int = 50, latency: float = 0.02, limit: int = 100) -> float:
+    """
+    Measure async order book throughput against the stub server.
+
+    Args:
+        n_requests: Order books to fetch
+        max_concurrency: Client concurrency cap
+        latency: Simulated server latency in seconds
+        limit: Depth per book
+
+    Returns:
+        Order books fetched per second
+    """
+    from source.async_extract import AsyncBinanceClient
+    from source.rate_limit import RateLimiter
+
+    server, root = start_stub_server(latency=latency)
+
+    async def run() -> float:
+        async with AsyncBinanceClient(
+            base_url=f"{root}/api/v3",
+            max_concurrency=max_concurrency,
+            rate_limiter=RateLimiter(default_rate_per_minute=1e9)
+        ) as client:
+            symbols = [f"SYM{i}USDT" for i in range(n_requests)]
+            start = time.perf_counter()
+            await client.fetch_orderbooks(symbols, limit=limit)
+            return n_requests / (time.perf_counter() - start)
+
+    try:
+        return asyncio.run(run())
+    finally:
+        server.shutdown()
+
+
+# Example usage
+if __name__ == "__main__":
+    for concurrency in (1, 10, 50):
+        rate = benchmark_orderbooks(n_requests=500, max_concurrency=concurrency)
+        print(f"concurrency={concurrency:3d}: {rate:8.1f} order books/s ({rate * 60:,.0f}/min)")
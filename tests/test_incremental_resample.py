@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+
+from source.incremental_resample import IncrementalResampler
+from source.transform_cleaning import resample_panel
+
+
+def _ticks(n: int = 20_000, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "coin_id": rng.choice([f"coin-{i}" for i in range(10)], n),
+        "timestamp": pd.Timestamp("2024-01-01", tz="UTC")
+        + pd.to_timedelta(np.sort(rng.integers(0, 5 * 86_400, n)), unit="s"),
+        "open": rng.lognormal(3, 1, n),
+        "close": rng.lognormal(3, 1, n),
+        "volume": rng.uniform(0, 10, n),
+    })
+
+
+def _expected(ticks: pd.DataFrame, agg_config: dict) -> pd.DataFrame:
+    full = resample_panel(ticks, "1h", agg_config=agg_config, max_fill=6)
+    last_open = full.groupby("coin_id")["timestamp"].transform("max")
+    return full[full["timestamp"] < last_open].reset_index(drop=True)
+
+
+def test_shuffled_chunks_match_full_resample(tmp_path):
+    ticks = _ticks()
+    rng = np.random.default_rng(1)
+
+    for chunk in np.array_split(np.arange(len(ticks)), 40):
+        resampler = IncrementalResampler("1h", base_path=str(tmp_path), max_fill=6)
+        resampler.update(ticks.iloc[rng.permutation(chunk)])
+
+    bars = resampler.read_bars()
+    expected = _expected(ticks, resampler.agg_config)
+    pd.testing.assert_frame_equal(bars[expected.columns], expected, check_dtype=False)
+
+
+def test_open_bucket_rows_out_of_order_across_runs(tmp_path):
+    ticks = pd.DataFrame({
+        "coin_id": ["a", "a", "a"],
+        "timestamp": pd.to_datetime(["2024-01-01 00:40", "2024-01-01 00:10", "2024-01-01 01:05"], utc=True),
+        "open": [2.0, 1.0, 3.0],
+        "close": [2.0, 1.0, 3.0],
+    })
+
+    for i in range(3):
+        resampler = IncrementalResampler("1h", base_path=str(tmp_path))
+        resampler.update(ticks.iloc[[i]])
+
+    bars = resampler.read_bars()
+    assert bars["open"].tolist() == [1.0]
+    assert bars["close"].tolist() == [2.0]
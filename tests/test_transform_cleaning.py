@@ -0,0 +1,81 @@
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from source.transform_cleaning import (
+    CLEANING_RANGES,
+    CleaningPipeline,
+    _synthetic_raw_prices,
+    benchmark_cleaning,
+    resample_panel,
+    resample_timeseries,
+)
+
+
+def _random_panel(n_coins: int = 30, n_rows: int = 3000, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    timestamps = pd.Timestamp("2024-01-01", tz="UTC") + pd.to_timedelta(
+        np.sort(rng.integers(0, 3 * 86_400, n_rows)), unit="s"
+    )
+    price = rng.lognormal(2, 0.5, n_rows)
+    return pd.DataFrame({
+        "coin_id": rng.choice([f"coin-{i}" for i in range(n_coins)], n_rows),
+        "timestamp": timestamps,
+        "open": price,
+        "high": price * 1.01,
+        "low": price * 0.99,
+        "close": price * 1.001,
+        "volume": rng.uniform(0, 10, n_rows),
+    })
+
+
+def test_resample_panel_uses_time_order_within_bar():
+    df = pd.DataFrame({
+        "coin_id": ["a", "a"],
+        "timestamp": pd.to_datetime(["2024-01-01 00:30", "2024-01-01 00:10"], utc=True),
+        "open": [2.0, 1.0],
+        "close": [2.0, 1.0],
+    })
+
+    bars = resample_panel(df, "1h")
+
+    assert bars["open"].tolist() == [1.0]
+    assert bars["close"].tolist() == [2.0]
+
+
+def test_resample_panel_matches_per_coin_resample_on_shuffled_input():
+    panel = _random_panel()
+    shuffled = panel.sample(frac=1, random_state=1)
+
+    bars = resample_panel(shuffled, "1h", max_fill=None)
+
+    for coin_id, rows in panel.groupby("coin_id"):
+        expected = resample_timeseries(rows.drop(columns="coin_id"), "1h")
+        got = bars[bars["coin_id"] == coin_id].drop(columns=["coin_id", "filled"])
+        pd.testing.assert_frame_equal(
+            got.reset_index(drop=True), expected.reset_index(drop=True), check_dtype=False
+        )
+
+
+@pytest.mark.parametrize("inplace", [False, True])
+@pytest.mark.parametrize("missing_method", ["ffill", "drop"])
+def test_cleaning_pipeline_matches_chained_functions(inplace, missing_method):
+    raw = _synthetic_raw_prices(20_000)
+    pipeline = CleaningPipeline(
+        ranges=CLEANING_RANGES, missing_method=missing_method, inplace=inplace, verbose=False
+    )
+
+    expected = pipeline.run_stepwise(raw.copy())
+    cleaned = pipeline.run(raw.copy())
+
+    pd.testing.assert_frame_equal(cleaned.reset_index(drop=True), expected.reset_index(drop=True))
+
+
+@pytest.mark.skipif(sys.platform != "linux", reason="ru_maxrss is reported in KB on Linux only")
+def test_cleaning_pipeline_lowers_peak_rss():
+    result = benchmark_cleaning(n_rows=1_000_000)
+
+    assert result.loc["pipeline", "relative"] < 0.9
+    assert result.loc["inplace", "relative"] <= result.loc["pipeline", "relative"]